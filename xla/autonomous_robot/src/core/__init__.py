@@ -16,6 +16,9 @@ from .config import (
     CAMERA_HEIGHT,
     CAMERA_FPS,
     CAMERA_OFFSET_X,
+    CAMERA_THREADED_CAPTURE,
+    CAMERA_FAST_ALIGN,
+    CAMERA_FAST_ALIGN_DEPTH,
     
     # Camera Calibration
     CAMERA_INTRINSIC_ENABLED,
@@ -40,6 +43,13 @@ from .config import (
     MORPH_KERNEL_SIZE,
     MORPH_CLOSE_ITERATIONS,
     MORPH_OPEN_ITERATIONS,
+    LINE_PROC_WIDTH,
+    LINE_FUSED_THRESHOLD,
+    LINE_ADAPTIVE_ONLY_MIN_FILL,
+    LINE_ADAPTIVE_ONLY_MAX_FILL,
+    LINE_BOX_BLUR,
+    LINE_LOW_LIGHT_MEAN,
+    LINE_LOW_CONTRAST_STD,
     CANNY_LOW_THRESHOLD,
     CANNY_HIGH_THRESHOLD,
     HOUGH_RHO,
@@ -62,6 +72,11 @@ from .config import (
     YOLO_MODEL_PATH,
     YOLO_CONFIDENCE_THRESHOLD,
     YOLO_NMS_THRESHOLD,
+    YOLO_TENSORRT_ENABLED,
+    YOLO_TENSORRT_HALF,
+    YOLO_TENSORRT_INT8,
+    YOLO_TENSORRT_CALIB_DATA,
+    YOLO_TENSORRT_WORKSPACE,
     DETECT_CLASSES,
     
     # Depth
@@ -74,6 +89,13 @@ from .config import (
     DEPTH_OFFSET,
     DEPTH_CALIBRATION_ENABLED,
     
+    # Depth Filter
+    DEPTH_FILTER_ENABLED,
+    DEPTH_FILTER_RADIUS,
+    DEPTH_FILTER_SIGMA_SPATIAL,
+    DEPTH_FILTER_SIGMA_RANGE,
+    DEPTH_FILTER_USE_CUDA,
+    
     # Obstacle
     D_SAFE,
     D_EMERGENCY,
@@ -38,6 +38,12 @@ CAMERA_OFFSET_X = 0  # Default centered camera
 CAMERA_FRAME_TIMEOUT_MS = 1500
 CAMERA_WARMUP_FRAMES = 10
 CAMERA_MAX_FAILURES = 5
+# Capture/align/convert frames on a background thread (get_frames returns the latest)
+CAMERA_THREADED_CAPTURE = False
+# Align depth to color with a precomputed remap (exact only at FAST_ALIGN_DEPTH)
+# instead of librealsense's per-pixel reprojection
+CAMERA_FAST_ALIGN = False
+CAMERA_FAST_ALIGN_DEPTH = 1.5  # meters
 
 # Camera Intrinsic Calibration
 CAMERA_INTRINSIC_ENABLED = False
@@ -75,6 +81,23 @@ MORPH_KERNEL_SIZE = 3
 MORPH_CLOSE_ITERATIONS = 3
 MORPH_OPEN_ITERATIONS = 1
 
+# Line detection working width: wider frames are downscaled to this first
+# (0 = process at the input resolution)
+LINE_PROC_WIDTH = 0
+# Fused one-pass threshold (numba): adaptive box mean instead of Gaussian
+# weights, ~4x cheaper at 640x480
+LINE_FUSED_THRESHOLD = False
+# Skip the Otsu intersection when the adaptive threshold alone fills this
+# fraction of the ROI (min < fill < max); equal values = always intersect
+LINE_ADAPTIVE_ONLY_MIN_FILL = 0.0
+LINE_ADAPTIVE_ONLY_MAX_FILL = 0.0
+# 3x3 box blur instead of 5x5 Gaussian before thresholding (cheaper, near-identical errors)
+LINE_BOX_BLUR = False
+# Go straight to the fixed BLACK_THRESHOLD on dark or flat ROIs (gray mean /
+# std dev below these; 0 = always try adaptive + Otsu first)
+LINE_LOW_LIGHT_MEAN = 0
+LINE_LOW_CONTRAST_STD = 0.0
+
 # Canny Edge Detection
 CANNY_LOW_THRESHOLD = 50
 CANNY_HIGH_THRESHOLD = 150
@@ -111,6 +134,13 @@ YOLO_MODEL_PATH = str(MODELS_DIR / "yolov8n.pt")
 YOLO_CONFIDENCE_THRESHOLD = 0.3
 YOLO_NMS_THRESHOLD = 0.4
 
+# TensorRT engine (exported next to the .pt weights on first use)
+YOLO_TENSORRT_ENABLED = False
+YOLO_TENSORRT_HALF = True        # FP16 engine (Tensor Cores on Jetson/RTX)
+YOLO_TENSORRT_INT8 = False       # INT8 engine (FP16 fallback layers), needs calibration data
+YOLO_TENSORRT_CALIB_DATA = None  # Dataset YAML with representative frames for INT8 calibration
+YOLO_TENSORRT_WORKSPACE = 1      # Builder workspace (GB)
+
 # Classes to detect (COCO dataset indices)
 # Set to None to detect all classes
 DETECT_CLASSES = None  # Detect all COCO classes
@@ -127,6 +157,13 @@ DEPTH_CORRECTION_FACTOR = 1.0
 DEPTH_OFFSET = 0.0
 DEPTH_CALIBRATION_ENABLED = False
 
+# Color-guided joint bilateral depth filter (applied in RealSenseCamera)
+DEPTH_FILTER_ENABLED = False
+DEPTH_FILTER_RADIUS = 2              # Window radius (pixels), window = (2r+1)^2
+DEPTH_FILTER_SIGMA_SPATIAL = 1.5     # Spatial sigma (pixels)
+DEPTH_FILTER_SIGMA_RANGE = 12.0      # Color difference sigma (0-255 intensity)
+DEPTH_FILTER_USE_CUDA = True         # Run on the GPU when numba.cuda finds one
+
 # =============================================================================
 # OBSTACLE DETECTION CONFIGURATION
 # =============================================================================
@@ -260,19 +297,26 @@ def load_config(config_path: Optional[str] = None) -> None:
     Args:
         config_path: Optional path to YAML config file
     """
-    global CAMERA_WIDTH, CAMERA_HEIGHT, CAMERA_FPS, CAMERA_OFFSET_X
+    global CAMERA_WIDTH, CAMERA_HEIGHT, CAMERA_FPS, CAMERA_OFFSET_X, CAMERA_THREADED_CAPTURE
+    global CAMERA_FAST_ALIGN, CAMERA_FAST_ALIGN_DEPTH
     global CAMERA_INTRINSIC_ENABLED, CAMERA_MATRIX, DISTORTION_COEFFICIENTS, REPROJECTION_ERROR
     global ROI_TOP_LEFT_X, ROI_TOP_RIGHT_X, ROI_BOTTOM_LEFT_X, ROI_BOTTOM_RIGHT_X
     global ROI_TOP_Y, ROI_BOTTOM_Y
     global DEPTH_MEDIAN_FILTER_SIZE, DEPTH_MIN_VALID, DEPTH_MAX_VALID
     global DEPTH_CORRECTION_FACTOR, DEPTH_OFFSET, DEPTH_CALIBRATION_ENABLED
+    global DEPTH_FILTER_ENABLED, DEPTH_FILTER_RADIUS
+    global DEPTH_FILTER_SIGMA_SPATIAL, DEPTH_FILTER_SIGMA_RANGE, DEPTH_FILTER_USE_CUDA
     global YOLO_MODEL_PATH, YOLO_CONFIDENCE_THRESHOLD, YOLO_NMS_THRESHOLD
+    global YOLO_TENSORRT_ENABLED, YOLO_TENSORRT_HALF, YOLO_TENSORRT_WORKSPACE
+    global YOLO_TENSORRT_INT8, YOLO_TENSORRT_CALIB_DATA
     global D_SAFE, D_EMERGENCY
     global PID_KP, PID_KI, PID_KD
     global SPEED_MAX, SPEED_MIN, SPEED_NORMAL, SPEED_SLOW
     global UART_PORT, UART_BAUDRATE
     global MAIN_LOOP_RATE_HZ, LOG_LEVEL, LEG_HEIGHT
-    global MORPH_KERNEL_SIZE, MORPH_CLOSE_ITERATIONS, MORPH_OPEN_ITERATIONS
+    global MORPH_KERNEL_SIZE, MORPH_CLOSE_ITERATIONS, MORPH_OPEN_ITERATIONS, LINE_PROC_WIDTH
+    global LINE_FUSED_THRESHOLD, LINE_ADAPTIVE_ONLY_MIN_FILL, LINE_ADAPTIVE_ONLY_MAX_FILL
+    global LINE_BOX_BLUR, LINE_LOW_LIGHT_MEAN, LINE_LOW_CONTRAST_STD
     global CANNY_LOW_THRESHOLD, CANNY_HIGH_THRESHOLD, BLACK_THRESHOLD
     global HOUGH_RHO, HOUGH_THRESHOLD, HOUGH_MIN_LINE_LENGTH, HOUGH_MAX_LINE_GAP
     
@@ -287,6 +331,9 @@ def load_config(config_path: Optional[str] = None) -> None:
     CAMERA_HEIGHT = camera.get('height', CAMERA_HEIGHT)
     CAMERA_FPS = camera.get('fps', CAMERA_FPS)
     CAMERA_OFFSET_X = camera.get('offset_x', CAMERA_OFFSET_X)
+    CAMERA_THREADED_CAPTURE = camera.get('threaded_capture', CAMERA_THREADED_CAPTURE)
+    CAMERA_FAST_ALIGN = camera.get('fast_align', CAMERA_FAST_ALIGN)
+    CAMERA_FAST_ALIGN_DEPTH = camera.get('fast_align_depth', CAMERA_FAST_ALIGN_DEPTH)
     
     # Camera intrinsic calibration
     intrinsic = camera.get('intrinsic_calibration', {})
@@ -318,6 +365,14 @@ def load_config(config_path: Optional[str] = None) -> None:
     DEPTH_OFFSET = depth_calib.get('offset', DEPTH_OFFSET)
     DEPTH_CALIBRATION_ENABLED = depth_calib.get('enabled', DEPTH_CALIBRATION_ENABLED)
     
+    # Depth filter
+    depth_filter = depth.get('filter', {})
+    DEPTH_FILTER_ENABLED = depth_filter.get('enabled', DEPTH_FILTER_ENABLED)
+    DEPTH_FILTER_RADIUS = depth_filter.get('radius', DEPTH_FILTER_RADIUS)
+    DEPTH_FILTER_SIGMA_SPATIAL = depth_filter.get('sigma_spatial', DEPTH_FILTER_SIGMA_SPATIAL)
+    DEPTH_FILTER_SIGMA_RANGE = depth_filter.get('sigma_range', DEPTH_FILTER_SIGMA_RANGE)
+    DEPTH_FILTER_USE_CUDA = depth_filter.get('use_cuda', DEPTH_FILTER_USE_CUDA)
+    
     # Object detection
     obj_det = config.get('object_detection', {})
     if obj_det.get('model_path'):
@@ -325,6 +380,13 @@ def load_config(config_path: Optional[str] = None) -> None:
     YOLO_CONFIDENCE_THRESHOLD = obj_det.get('confidence_threshold', YOLO_CONFIDENCE_THRESHOLD)
     YOLO_NMS_THRESHOLD = obj_det.get('nms_threshold', YOLO_NMS_THRESHOLD)
     
+    tensorrt = obj_det.get('tensorrt', {})
+    YOLO_TENSORRT_ENABLED = tensorrt.get('enabled', YOLO_TENSORRT_ENABLED)
+    YOLO_TENSORRT_HALF = tensorrt.get('half', YOLO_TENSORRT_HALF)
+    YOLO_TENSORRT_INT8 = tensorrt.get('int8', YOLO_TENSORRT_INT8)
+    YOLO_TENSORRT_CALIB_DATA = tensorrt.get('calibration_data', YOLO_TENSORRT_CALIB_DATA)
+    YOLO_TENSORRT_WORKSPACE = tensorrt.get('workspace', YOLO_TENSORRT_WORKSPACE)
+    
     # Obstacle
     obstacle = config.get('obstacle', {})
     D_SAFE = obstacle.get('d_safe', D_SAFE)
@@ -354,6 +416,13 @@ def load_config(config_path: Optional[str] = None) -> None:
     MORPH_KERNEL_SIZE = lane.get('morph_kernel_size', MORPH_KERNEL_SIZE)
     MORPH_CLOSE_ITERATIONS = lane.get('morph_close_iterations', MORPH_CLOSE_ITERATIONS)
     MORPH_OPEN_ITERATIONS = lane.get('morph_open_iterations', MORPH_OPEN_ITERATIONS)
+    LINE_PROC_WIDTH = lane.get('proc_width', LINE_PROC_WIDTH)
+    LINE_FUSED_THRESHOLD = lane.get('fused_threshold', LINE_FUSED_THRESHOLD)
+    LINE_ADAPTIVE_ONLY_MIN_FILL = lane.get('adaptive_only_min_fill', LINE_ADAPTIVE_ONLY_MIN_FILL)
+    LINE_ADAPTIVE_ONLY_MAX_FILL = lane.get('adaptive_only_max_fill', LINE_ADAPTIVE_ONLY_MAX_FILL)
+    LINE_BOX_BLUR = lane.get('box_blur', LINE_BOX_BLUR)
+    LINE_LOW_LIGHT_MEAN = lane.get('low_light_mean', LINE_LOW_LIGHT_MEAN)
+    LINE_LOW_CONTRAST_STD = lane.get('low_contrast_std', LINE_LOW_CONTRAST_STD)
     CANNY_LOW_THRESHOLD = lane.get('canny_low', CANNY_LOW_THRESHOLD)
     CANNY_HIGH_THRESHOLD = lane.get('canny_high', CANNY_HIGH_THRESHOLD)
     HOUGH_RHO = lane.get('hough_rho', HOUGH_RHO)
@@ -417,12 +486,15 @@ def print_config() -> None:
     print(f"\n[Camera]")
     print(f"  Resolution: {CAMERA_WIDTH}x{CAMERA_HEIGHT} @ {CAMERA_FPS}fps")
     print(f"  Offset X: {CAMERA_OFFSET_X} px")
+    print(f"  Threaded capture: {CAMERA_THREADED_CAPTURE}")
+    print(f"  Fast align: {CAMERA_FAST_ALIGN} (plane at {CAMERA_FAST_ALIGN_DEPTH} m)")
     print(f"\n[ROI Trapezoid]")
     print(f"  Top: Y={ROI_TOP_Y:.0%}, X=[{ROI_TOP_LEFT_X:.0%}-{ROI_TOP_RIGHT_X:.0%}]")
     print(f"  Bottom: Y={ROI_BOTTOM_Y:.0%}, X=[{ROI_BOTTOM_LEFT_X:.0%}-{ROI_BOTTOM_RIGHT_X:.0%}]")
     print(f"\n[Object Detection]")
     print(f"  Model: {YOLO_MODEL_PATH}")
     print(f"  Confidence: {YOLO_CONFIDENCE_THRESHOLD}")
+    print(f"  TensorRT: {YOLO_TENSORRT_ENABLED} (half={YOLO_TENSORRT_HALF}, int8={YOLO_TENSORRT_INT8})")
     print(f"\n[Safety]")
     print(f"  Safe Distance: {D_SAFE}m")
     print(f"  Emergency Distance: {D_EMERGENCY}m")
@@ -6,19 +6,23 @@ Contains different autonomous operation modes:
 - PatrolMode: Patrol and detect intruders using AI
 """
 
-from .base_mode import BaseMode, ModeState, ModeOutput
+from .base_mode import BaseMode, ModeState, ModeOutput, HUDState, FeedbackSource
 from .line_following_mode import LineFollowingMode, LineFollowingConfig
 from .object_tracking_mode import ObjectTrackingMode, ObjectTrackingConfig
 from .patrol_mode import PatrolMode, PatrolConfig
+from .hud import render_hud_qt
 
 __all__ = [
     'BaseMode',
     'ModeState',
     'ModeOutput',
+    'HUDState',
+    'FeedbackSource',
     'LineFollowingMode',
     'LineFollowingConfig',
     'ObjectTrackingMode',
     'ObjectTrackingConfig',
     'PatrolMode',
     'PatrolConfig',
+    'render_hud_qt',
 ]
@@ -3,15 +3,29 @@ Base Mode - Abstract base class for all robot operation modes.
 Defines common interface and shared functionality.
 """
 
+import os
 import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum, auto
-from typing import Optional, Tuple, Any
+from typing import Optional, Tuple, Any, Protocol
+import cv2
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# OpenCV tuning shared by all modes: enable IPP/SIMD code paths and cap the
+# OpenCV worker pool so drawing/preprocessing does not oversubscribe the cores
+# used by the camera capture, detection and UART control threads.
+# Override with ROBOT_CV_THREADS (0 = run OpenCV single-threaded).
+cv2.setUseOptimized(True)
+cv2.setNumThreads(int(os.getenv('ROBOT_CV_THREADS', '2')))
+
+# OpenCL (transparent API) is opt-in with ROBOT_CV_OPENCL=1: the upload and
+# download cost more than they save for small frames on most robot boards.
+# Text and rectangle drawing have no OpenCL kernels and always stay on the CPU.
+cv2.ocl.setUseOpenCL(os.getenv('ROBOT_CV_OPENCL', '0') == '1')
+
 
 class ModeState(Enum):
     """States that any mode can be in."""
@@ -23,6 +37,25 @@ class ModeState(Enum):
     COMPLETED = auto()      # Task completed (for finite tasks)
 
 
+class FeedbackSource(Protocol):
+    """Odometry feedback accepted by process() (e.g. communication.RobotFeedback)."""
+    velocity: float     # Measured linear velocity (m/s)
+    yaw: float          # Measured yaw angle (rad)
+
+
+@dataclass
+class HUDState:
+    """
+    Status values shown on the HUD overlay.
+    Lets a GUI viewer draw the status itself instead of baking it into the frame.
+    """
+    state_name: str = ""
+    velocity: float = 0.0
+    yaw_rate: float = 0.0
+    confidence: float = 0.0
+    detection_rate: float = 0.0
+
+
 @dataclass
 class ModeOutput:
     """
@@ -45,6 +78,9 @@ class ModeOutput:
     # Optional visualization frame
     viz_frame: Optional[np.ndarray] = None
     
+    # Optional HUD values (for GUI-rendered overlays)
+    hud: Optional[HUDState] = None
+    
     # Should robot stop immediately?
     emergency_stop: bool = False
 
@@ -65,6 +101,10 @@ class BaseMode(ABC):
         self._frame_count = 0
         self._enabled = False
         
+        # Closed-loop feedback (enabled by register_feedback_source)
+        self._use_feedback = False
+        self._feedback_ignored_logged = False
+        
         # Control parameters (can be overridden by subclasses)
         self.max_velocity = 2.0      # m/s
         self.min_velocity = 0.0      # m/s
@@ -104,6 +144,16 @@ class BaseMode(ABC):
             self._state = ModeState.RUNNING
             logger.info(f"{self.get_name()} resumed")
     
+    def register_feedback_source(self, source: FeedbackSource) -> None:
+        """
+        Enable closed-loop correction using feedback passed to process().
+        
+        Checked once here instead of probing the feedback object every frame.
+        Passing None disables it again.
+        """
+        self._use_feedback = source is not None
+        logger.info(f"{self.get_name()} feedback {'enabled' if self._use_feedback else 'disabled'}")
+    
     @abstractmethod
     def process(
         self, 
@@ -117,13 +167,22 @@ class BaseMode(ABC):
         Args:
             color_frame: BGR image from camera
             depth_frame: Depth image (optional)
-            feedback: Odometry feedback from robot (optional)
+            feedback: Odometry feedback from robot (optional). Only used
+                after register_feedback_source(); otherwise ignored
             
         Returns:
             ModeOutput with velocity commands and status
         """
         pass
     
+    def _log_feedback_ignored(self) -> None:
+        """Warn once that process() got feedback with no source registered."""
+        if not self._feedback_ignored_logged:
+            self._feedback_ignored_logged = True
+            logger.warning(
+                f"{self.get_name()} ignoring feedback: call register_feedback_source() to enable it"
+            )
+    
     @abstractmethod
     def reset(self) -> None:
         """Reset mode to initial state."""
@@ -0,0 +1,75 @@
+"""
+HUD Rendering for GUI viewers.
+Draws ModeOutput.hud with Qt instead of baking the status bar into the frame.
+"""
+
+from typing import Dict, Tuple
+
+try:
+    from PyQt5.QtCore import QPointF
+    from PyQt5.QtGui import QColor, QStaticText
+    QT_AVAILABLE = True
+except ImportError:
+    QT_AVAILABLE = False
+
+from .base_mode import HUDState
+
+# RGB colors per state name (Qt uses RGB, not BGR)
+_STATE_COLORS_RGB = {
+    'RUNNING': (0, 255, 0),
+    'SEARCHING': (255, 255, 0),
+    'ERROR': (255, 0, 0),
+    'PAUSED': (0, 255, 255),
+}
+
+# Laid-out text is cached; values are rounded so the set of strings stays small
+_STATIC_TEXT_CACHE: Dict[str, "QStaticText"] = {}
+_STATIC_TEXT_CACHE_MAX = 512
+
+
+def _static_text(text: str) -> "QStaticText":
+    """Get a cached QStaticText for the given string."""
+    static = _STATIC_TEXT_CACHE.get(text)
+    if static is None:
+        if len(_STATIC_TEXT_CACHE) >= _STATIC_TEXT_CACHE_MAX:
+            _STATIC_TEXT_CACHE.clear()
+        static = QStaticText(text)
+        _STATIC_TEXT_CACHE[text] = static
+    return static
+
+
+def render_hud_qt(
+    painter,
+    hud: HUDState,
+    origin: Tuple[int, int] = (10, 10),
+    line_height: int = 18
+) -> None:
+    """
+    Draw HUD values with a QPainter (e.g. inside QWidget.paintEvent).
+
+    Args:
+        painter: Active QPainter
+        hud: HUD values from ModeOutput.hud
+        origin: Top-left corner of the HUD (pixels)
+        line_height: Vertical spacing between lines (pixels)
+    """
+    if not QT_AVAILABLE:
+        raise RuntimeError("PyQt5 not installed - use the cv2 status overlay instead")
+
+    if hud is None:
+        return
+
+    x, y = origin
+    state_color = QColor(*_STATE_COLORS_RGB.get(hud.state_name, (255, 255, 255)))
+    white = QColor(255, 255, 255)
+
+    lines = (
+        (hud.state_name, state_color),
+        (f"V:{hud.velocity:.2f} Y:{hud.yaw_rate:+.2f}", white),
+        (f"Conf:{hud.confidence:.0%}", white),
+        (f"Det:{hud.detection_rate:.0%}", QColor(200, 200, 200)),
+    )
+
+    for i, (text, color) in enumerate(lines):
+        painter.setPen(color)
+        painter.drawStaticText(QPointF(x, y + i * line_height), _static_text(text))
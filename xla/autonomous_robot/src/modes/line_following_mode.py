@@ -9,11 +9,22 @@ import logging
 from typing import Optional, Any
 from dataclasses import dataclass
 
-from .base_mode import BaseMode, ModeOutput, ModeState
+from .base_mode import BaseMode, ModeOutput, ModeState, HUDState, FeedbackSource
 from src.perception import SimpleLineDetector, LineDetectionResult
 
 logger = logging.getLogger(__name__)
 
+# Status bar color (BGR) per ModeState, indexed by ModeState.value
+_STATE_COLORS = (
+    (255, 255, 255),    # (unused, enum values start at 1)
+    (255, 255, 255),    # IDLE
+    (0, 255, 0),        # RUNNING
+    (0, 255, 255),      # SEARCHING
+    (255, 255, 0),      # PAUSED
+    (0, 0, 255),        # ERROR
+    (255, 255, 255),    # COMPLETED
+)
+
 
 @dataclass
 class LineFollowingConfig:
@@ -33,6 +44,13 @@ class LineFollowingConfig:
     
     # Velocity modulation based on curvature
     curvature_slowdown: float = 0.8  # How much to slow down in curves (0-1)
+    
+    # Detection resolution: the detector downscales wider frames to this
+    # width (area averaging keeps thin lines). None = lane_detection.proc_width
+    proc_width: Optional[int] = None
+    
+    # Visualization
+    headless_hud: bool = False       # Skip cv2 status bar, GUI renders ModeOutput.hud
 
 
 class LineFollowingMode(BaseMode):
@@ -59,7 +77,7 @@ class LineFollowingMode(BaseMode):
         super().__init__()
         
         self.config = config or LineFollowingConfig()
-        self.line_detector = SimpleLineDetector()
+        self.line_detector = SimpleLineDetector(proc_width=self.config.proc_width)
         
         # State tracking
         self._frames_lost = 0
@@ -99,7 +117,8 @@ class LineFollowingMode(BaseMode):
         Args:
             color_frame: BGR image from camera
             depth_frame: Not used in this mode
-            feedback: Robot feedback (velocity, position, yaw)
+            feedback: Robot feedback (velocity, position, yaw); only used
+                after register_feedback_source()
             
         Returns:
             ModeOutput with velocity and yaw_rate commands
@@ -113,7 +132,8 @@ class LineFollowingMode(BaseMode):
         self._total_frames += 1
         self._frame_count += 1
         
-        # Detect line
+        # Detect line (downscaled to proc_width inside the detector, pixel
+        # fields come back in full-resolution coordinates)
         result = self.line_detector.detect(color_frame)
         
         # Create visualization
@@ -224,11 +244,12 @@ class LineFollowingMode(BaseMode):
     def _calculate_velocity(
         self, 
         result: LineDetectionResult,
-        feedback: Optional[Any] = None
+        feedback: Optional[FeedbackSource] = None
     ) -> float:
         """
         Calculate forward velocity based on line curvature and errors.
         Slow down in curves, speed up on straight sections.
+        Feedback is only used after register_feedback_source().
         """
         # Error magnitude (higher error = more curve = slower)
         error_magnitude = abs(result.position_error) + abs(result.heading_error) / 1.57
@@ -246,10 +267,12 @@ class LineFollowingMode(BaseMode):
                    (self.config.max_speed - self.config.min_speed) * speed_factor
         
         # Apply closed-loop correction if feedback available
-        if feedback is not None and hasattr(feedback, 'velocity'):
+        if self._use_feedback and feedback is not None:
             # Simple P control to match target velocity
             v_error = velocity - feedback.velocity
             velocity += 0.3 * v_error
+        elif feedback is not None:
+            self._log_feedback_ignored()
         
         return self._clamp_velocity(velocity)
     
@@ -259,9 +282,23 @@ class LineFollowingMode(BaseMode):
         output: ModeOutput,
         result: LineDetectionResult
     ) -> np.ndarray:
-        """Add status information overlay to visualization frame."""
-        if frame is None:
-            return None
+        """
+        Add status information overlay to visualization frame.
+        
+        Always fills output.hud. When config.headless_hud is set the frame is
+        returned untouched and the viewer draws the HUD (see render_hud_qt).
+        """
+        detection_rate = self._line_detected_frames / max(1, self._total_frames)
+        output.hud = HUDState(
+            state_name=output.state.name,
+            velocity=output.velocity,
+            yaw_rate=output.yaw_rate,
+            confidence=output.confidence,
+            detection_rate=detection_rate
+        )
+        
+        if frame is None or self.config.headless_hud:
+            return frame
         
         h, w = frame.shape[:2]
         
@@ -273,12 +310,7 @@ class LineFollowingMode(BaseMode):
         )
         
         # Mode and state
-        state_color = {
-            ModeState.RUNNING: (0, 255, 0),
-            ModeState.SEARCHING: (0, 255, 255),
-            ModeState.ERROR: (0, 0, 255),
-            ModeState.PAUSED: (255, 255, 0),
-        }.get(output.state, (255, 255, 255))
+        state_color = _STATE_COLORS[output.state.value]
         
         cv2.putText(
             frame_with_bar, 
@@ -305,10 +337,9 @@ class LineFollowingMode(BaseMode):
         
         # Detection rate
         if self._total_frames > 0:
-            rate = self._line_detected_frames / self._total_frames
             cv2.putText(
                 frame_with_bar,
-                f"Det:{rate:.0%}",
+                f"Det:{detection_rate:.0%}",
                 (550, h + 25),
                 cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1
             )
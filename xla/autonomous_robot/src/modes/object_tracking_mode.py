@@ -14,6 +14,17 @@ from src.perception import ObjectDetector, DepthEstimator
 
 logger = logging.getLogger(__name__)
 
+# Status bar color (BGR) per ModeState, indexed by ModeState.value
+_STATE_COLORS = (
+    (255, 255, 255),    # (unused, enum values start at 1)
+    (255, 255, 255),    # IDLE
+    (0, 255, 0),        # RUNNING
+    (0, 255, 255),      # SEARCHING
+    (255, 255, 255),    # PAUSED
+    (0, 0, 255),        # ERROR
+    (255, 255, 255),    # COMPLETED
+)
+
 
 @dataclass
 class ObjectTrackingConfig:
@@ -92,6 +103,9 @@ class ObjectTrackingMode(BaseMode):
         self._smoothed_yaw_rate = 0.0
         self._smoothed_velocity = 0.0
         
+        # Reusable visualization buffer (allocated on first frame)
+        self._vis_buf = None
+        
         # Statistics
         self._total_frames = 0
         self._tracking_frames = 0
@@ -137,7 +151,9 @@ class ObjectTrackingMode(BaseMode):
         
         Args:
             color_frame: BGR image from camera
-            depth_frame: Depth image from camera
+            depth_frame: Depth image from camera, HxW float meters aligned to
+                         color. Made C-contiguous here so per-box depth
+                         reductions run on a contiguous buffer.
             feedback: Robot feedback (velocity, position, yaw)
             
         Returns:
@@ -149,6 +165,9 @@ class ObjectTrackingMode(BaseMode):
         if color_frame is None or color_frame.size == 0:
             return self._create_stop_output("Invalid frame")
         
+        if depth_frame is not None and not depth_frame.flags['C_CONTIGUOUS']:
+            depth_frame = np.ascontiguousarray(depth_frame)
+        
         self._total_frames += 1
         self._frame_count += 1
         
@@ -353,6 +372,30 @@ class ObjectTrackingMode(BaseMode):
         
         return self._smoothed_velocity
     
+    def filter_yaw_rates(self, target_yaws: np.ndarray) -> np.ndarray:
+        """
+        Smooth a batch of target yaw rates with the same EMA as _calculate_yaw_rate.
+        Continues from (and updates) the current smoothing state.
+        """
+        filtered = _ema_filter(
+            target_yaws, self.config.yaw_smoothing, self._smoothed_yaw_rate
+        )
+        if filtered.size:
+            self._smoothed_yaw_rate = float(filtered[-1])
+        return filtered
+    
+    def filter_velocities(self, target_velocities: np.ndarray) -> np.ndarray:
+        """
+        Smooth a batch of target velocities with the same EMA as _calculate_velocity.
+        Continues from (and updates) the current smoothing state.
+        """
+        filtered = _ema_filter(
+            target_velocities, self.config.velocity_smoothing, self._smoothed_velocity
+        )
+        if filtered.size:
+            self._smoothed_velocity = float(filtered[-1])
+        return filtered
+    
     def _create_visualization(
         self,
         frame: np.ndarray,
@@ -361,7 +404,11 @@ class ObjectTrackingMode(BaseMode):
         output: ModeOutput
     ) -> np.ndarray:
         """Create visualization with detection boxes and status."""
-        vis = frame.copy()
+        # Reuse the drawing buffer instead of allocating a new copy each frame
+        if self._vis_buf is None or self._vis_buf.shape != frame.shape:
+            self._vis_buf = np.empty_like(frame)
+        np.copyto(self._vis_buf, frame)
+        vis = self._vis_buf
         h, w = vis.shape[:2]
         
         # Draw all detections
@@ -408,11 +455,7 @@ class ObjectTrackingMode(BaseMode):
         )
         
         # State color
-        state_color = {
-            ModeState.RUNNING: (0, 255, 0),
-            ModeState.SEARCHING: (0, 255, 255),
-            ModeState.ERROR: (0, 0, 255),
-        }.get(output.state, (255, 255, 255))
+        state_color = _STATE_COLORS[output.state.value]
         
         # Mode and target
         cv2.putText(
@@ -456,3 +499,34 @@ class ObjectTrackingMode(BaseMode):
         """Set desired distance from target."""
         self.config.target_distance = max(0.5, min(5.0, distance))
         logger.info(f"Target distance set to {self.config.target_distance:.1f}m")
+
+
+def _ema_filter(values: np.ndarray, smoothing: float, initial: float) -> np.ndarray:
+    """
+    Apply y[n] = (1 - a) * x[n] + a * y[n-1] to a batch of samples.
+    
+    Written as a single first-order SOS section so scipy runs the whole batch
+    in one call; falls back to a Python loop without scipy. scipy is imported
+    here rather than at module level, since importing it costs most of a
+    second and nothing on the per-frame path uses it.
+    """
+    x = np.asarray(values, dtype=np.float64).ravel()
+    a = smoothing
+    
+    try:
+        from scipy import signal
+    except ImportError:
+        signal = None
+    
+    if signal is not None:
+        sos = np.array([[1.0 - a, 0.0, 0.0, 1.0, -a, 0.0]])
+        zi = np.array([[a * initial, 0.0]])
+        y, _ = signal.sosfilt(sos, x, zi=zi)
+        return y
+    
+    y = np.empty_like(x)
+    prev = initial
+    for i in range(x.size):
+        prev = (1.0 - a) * x[i] + a * prev
+        y[i] = prev
+    return y
@@ -7,15 +7,20 @@ import cv2
 import numpy as np
 import logging
 import time
-from typing import Optional, Any, List, Tuple
+import copy
+from concurrent.futures import Future
+from typing import Optional, Any, Dict, List, Tuple
 from dataclasses import dataclass, field
 from enum import Enum, auto
 
 from .base_mode import BaseMode, ModeOutput, ModeState
-from src.perception import ObjectDetector, DepthEstimator
+from .patrol_scoring import score_persons, score_persons_multi
 
 logger = logging.getLogger(__name__)
 
+# Messages contain rounded distances, so the set of strings stays small
+_TEXT_MASK_CACHE_MAX = 256
+
 
 class PatrolState(Enum):
     """Sub-states for patrol mode."""
@@ -52,6 +57,24 @@ class PatrolConfig:
     tracking_gain: float = 1.5          # Steering gain when tracking
     max_track_time: float = 10.0        # Maximum time to track before returning
     
+    # Frames wider than this are downscaled once before detection
+    # (boxes are mapped back to full resolution for depth/visualization)
+    detection_width: int = 640
+    
+    # Run the detector every N frames, following the intruder with sparse
+    # optical flow in between (1 = detect every frame)
+    detect_interval: int = 3
+    
+    # Tracked frames in a row that may reuse the last distance when the depth
+    # inside the moved box is invalid (then a detection is forced)
+    max_stale_depth_frames: int = 1
+    
+    # Pipelining: run detection in the background and use the result one
+    # frame late, so inference overlaps capture/visualization. Turns off
+    # detect_interval tracking (late boxes would seed the tracker on the
+    # wrong frame)
+    async_detection: bool = False
+    
     # Sound alert (placeholder - needs actual implementation)
     enable_sound_alert: bool = True
     
@@ -63,12 +86,40 @@ class PatrolConfig:
 @dataclass
 class Intruder:
     """Detected intruder information."""
+    __slots__ = ('bbox', 'center_x', 'center_y', 'distance', 'confidence', 'timestamp')
+    
     bbox: Tuple[int, int, int, int]  # x1, y1, x2, y2
     center_x: float                   # Normalized center x (-1 to 1)
     center_y: float                   # Normalized center y (-1 to 1)
     distance: float                   # Distance in meters
     confidence: float                 # Detection confidence
-    timestamp: float                  # Detection time
+    timestamp: float                  # Detection time (wall clock)
+    
+    def update(
+        self,
+        bbox: Tuple[int, int, int, int],
+        center_x: float,
+        center_y: float,
+        distance: float,
+        confidence: float,
+        timestamp: float
+    ) -> "Intruder":
+        """Overwrite all fields in place and return self."""
+        self.bbox = bbox
+        self.center_x = center_x
+        self.center_y = center_y
+        self.distance = distance
+        self.confidence = confidence
+        self.timestamp = timestamp
+        return self
+
+
+@dataclass
+class FrameJob:
+    """Frame whose detection is running in the background."""
+    color_frame: np.ndarray
+    depth_frame: Optional[np.ndarray]
+    det_future: Future
 
 
 class PatrolMode(BaseMode):
@@ -102,20 +153,66 @@ class PatrolMode(BaseMode):
         self.config = config or PatrolConfig()
         
         # Initialize perception
+        # Imported here so selecting another mode never loads the detector
+        from src.perception import ObjectDetector, DepthEstimator
         self.object_detector = ObjectDetector()
         self.depth_estimator = DepthEstimator()
         
+        # Only the intruder class is needed - filter it inside the detector
+        self._detect_class_ids = self.object_detector.get_class_ids([self.config.detect_class])
+        
         # Patrol state
         self._patrol_state = PatrolState.PATROLLING
-        self._state_start_time = time.time()
+        self._state_start_time = time.monotonic()
         self._patrol_cycle = 0
         
+        # State timing uses the monotonic clock; this offset turns it into
+        # wall-clock time for Intruder.timestamp without another clock read
+        self._wall_clock_offset = time.time() - time.monotonic()
+        
         # Detection state
         self._current_intruder: Optional[Intruder] = None
         self._intruders_detected: List[Intruder] = []
+        
+        # Per-frame intruder, updated in place (copied only when an alert starts)
+        self._scratch_intruder = Intruder((0, 0, 0, 0), 0.0, 0.0, 0.0, 0.0, 0.0)
         self._alert_start_time: Optional[float] = None
         self._track_start_time: Optional[float] = None
         
+        # In-flight detection (async_detection only)
+        self._pending_job: Optional[FrameJob] = None
+        
+        # Detection input size for the current frame shape (None = full res)
+        self._det_frame_shape: Optional[Tuple[int, int]] = None
+        self._det_size: Optional[Tuple[int, int]] = None
+        self._det_scale = 1.0
+        
+        # Cached 1 / (frame_size / 2) for center normalization
+        self._norm_frame_shape: Optional[Tuple[int, int]] = None
+        self._inv_half_wh: Optional[np.ndarray] = None
+        
+        # Optical-flow tracking between detections (detect_interval > 1)
+        self._frames_since_detect = 0
+        self._tracked_intruder: Optional[Intruder] = None
+        self._track_points: Optional[np.ndarray] = None
+        self._prev_gray: Optional[np.ndarray] = None
+        self._stale_depth_frames = 0
+        
+        # Rasterized text (stroke pixel indices) keyed by (text, scale, thickness)
+        self._text_mask_cache: Dict[Tuple[str, float, int], tuple] = {}
+        
+        # Visualization (turn off with enable_viz(False) when nothing displays it)
+        self._viz_enabled = True
+        
+        # Visualization buffer, reused every frame (allocated on first frame)
+        self._viz_buffer: Optional[np.ndarray] = None
+        
+        # Pre-rendered overlay parts (text only changes on state transitions)
+        self._status_bar_cache: Dict[Tuple[bool, int], np.ndarray] = {}
+        self._info_strip_key: Optional[tuple] = None
+        self._info_strip: Optional[np.ndarray] = None
+        self._info_strip_mask: Optional[np.ndarray] = None
+        
         # Callback for alerts (can be set by user)
         self._alert_callback = None
         
@@ -129,12 +226,18 @@ class PatrolMode(BaseMode):
         """Reset mode state."""
         self._state = ModeState.IDLE
         self._patrol_state = PatrolState.PATROLLING
-        self._state_start_time = time.time()
+        self._state_start_time = time.monotonic()
         self._patrol_cycle = 0
         self._current_intruder = None
         self._intruders_detected = []
         self._alert_start_time = None
         self._track_start_time = None
+        self._pending_job = None
+        self._frames_since_detect = 0
+        self._tracked_intruder = None
+        self._track_points = None
+        self._prev_gray = None
+        self._stale_depth_frames = 0
         logger.info("PatrolMode reset")
     
     def set_alert_callback(self, callback) -> None:
@@ -146,6 +249,17 @@ class PatrolMode(BaseMode):
         """
         self._alert_callback = callback
     
+    def enable_viz(self, enabled: bool) -> None:
+        """
+        Turn the overlay frame on or off.
+        
+        With no display or recorder attached, disabling it skips all drawing;
+        output.viz_frame is then None.
+        """
+        self._viz_enabled = enabled
+        if not enabled:
+            self._viz_buffer = None
+    
     def get_intruder_history(self) -> List[Intruder]:
         """Get list of all detected intruders."""
         return self._intruders_detected.copy()
@@ -174,17 +288,17 @@ class PatrolMode(BaseMode):
             return self._create_stop_output("Invalid frame")
         
         self._frame_count += 1
-        current_time = time.time()
+        current_time = time.monotonic()
         
-        # Always run detection
-        intruder = self._detect_intruder(color_frame, depth_frame)
+        # Detect (or track between detections)
+        intruder = self._detect_or_track(color_frame, depth_frame, current_time)
         
         # State machine
         if intruder is not None:
             # Intruder detected!
             if self._patrol_state != PatrolState.ALERT and \
                self._patrol_state != PatrolState.TRACKING:
-                self._trigger_alert(intruder)
+                self._trigger_alert(intruder, current_time)
         
         # Process based on current state
         if self._patrol_state == PatrolState.ALERT:
@@ -199,16 +313,140 @@ class PatrolMode(BaseMode):
             output = self._process_patrolling(current_time)
         
         # Add visualization
-        output.viz_frame = self._create_visualization(
-            color_frame, intruder, output
-        )
+        if self._viz_enabled:
+            output.viz_frame = self._create_visualization(
+                color_frame, intruder, output
+            )
         
         return output
     
+    def _detect_or_track(
+        self,
+        color_frame: np.ndarray,
+        depth_frame: Optional[np.ndarray],
+        current_time: float
+    ) -> Optional[Intruder]:
+        """
+        Run the detector every detect_interval frames and track in between.
+        Falls back to a full detection whenever tracking fails.
+        """
+        interval = max(1, self.config.detect_interval)
+        if self.config.async_detection:
+            # The async result belongs to the previous frame; its box must
+            # not seed optical flow on this one
+            interval = 1
+        
+        if (interval > 1 and self._tracked_intruder is not None and
+                self._frames_since_detect < interval):
+            intruder = self._track_intruder(color_frame, depth_frame, current_time)
+            if intruder is not None:
+                self._frames_since_detect += 1
+                return intruder
+        
+        intruder = self._detect_intruder(color_frame, depth_frame, current_time)
+        self._frames_since_detect = 1
+        self._stale_depth_frames = 0
+        self._tracked_intruder = intruder
+        if intruder is not None and interval > 1:
+            self._init_tracker(color_frame, intruder)
+        return intruder
+    
+    def _init_tracker(self, color_frame: np.ndarray, intruder: Intruder) -> None:
+        """Pick corner features inside the intruder box to follow with optical flow."""
+        gray = cv2.cvtColor(color_frame, cv2.COLOR_BGR2GRAY)
+        x1, y1, x2, y2 = intruder.bbox
+        h, w = gray.shape
+        x1, x2 = max(0, x1), min(w, x2)
+        y1, y2 = max(0, y1), min(h, y2)
+        
+        self._prev_gray = gray
+        self._track_points = None
+        if x2 - x1 < 8 or y2 - y1 < 8:
+            return
+        
+        points = cv2.goodFeaturesToTrack(
+            gray[y1:y2, x1:x2], maxCorners=30, qualityLevel=0.01, minDistance=5
+        )
+        if points is not None and len(points) >= 4:
+            points += np.array([x1, y1], dtype=np.float32)
+            self._track_points = points
+    
+    def _track_intruder(
+        self,
+        color_frame: np.ndarray,
+        depth_frame: Optional[np.ndarray],
+        current_time: float
+    ) -> Optional[Intruder]:
+        """
+        Move the last intruder box by the median optical-flow shift.
+        
+        Returns:
+            Updated Intruder, or None if tracking failed or the intruder is
+            no longer within alert_distance (forces a detection)
+        """
+        if self._track_points is None or self._prev_gray is None:
+            return None
+        
+        gray = cv2.cvtColor(color_frame, cv2.COLOR_BGR2GRAY)
+        if gray.shape != self._prev_gray.shape:
+            return None
+        
+        new_points, status, _ = cv2.calcOpticalFlowPyrLK(
+            self._prev_gray, gray, self._track_points, None
+        )
+        good = status.ravel() == 1
+        if np.count_nonzero(good) < 4:
+            return None
+        
+        dx, dy = np.median(new_points[good] - self._track_points[good], axis=0).ravel()
+        self._track_points = new_points[good].reshape(-1, 1, 2)
+        self._prev_gray = gray
+        
+        previous = self._tracked_intruder
+        h, w = gray.shape
+        x1, y1, x2, y2 = previous.bbox
+        dx, dy = float(dx), float(dy)
+        x1 = int(max(0, min(w - 1, x1 + dx)))
+        x2 = int(max(0, min(w - 1, x2 + dx)))
+        y1 = int(max(0, min(h - 1, y1 + dy)))
+        y2 = int(max(0, min(h - 1, y2 + dy)))
+        if (x2 - x1) * (y2 - y1) < self.config.min_box_area:
+            return None
+        
+        # Re-sample depth at the new box, keep the last value if invalid
+        # (for at most max_stale_depth_frames frames in a row)
+        bbox = (x1, y1, x2, y2)
+        distance = float(self.object_detector.measure_depths(depth_frame, np.array([bbox]))[0])
+        if distance <= 0:
+            if self._stale_depth_frames >= self.config.max_stale_depth_frames:
+                return None
+            self._stale_depth_frames += 1
+            distance = previous.distance
+        else:
+            self._stale_depth_frames = 0
+        
+        # Same distance gate as score_persons applies on detection frames
+        if distance > self.config.alert_distance:
+            return None
+        
+        center_x = ((x1 + x2) * 0.5) * self._inv_half_wh[0] - 1.0
+        center_y = ((y1 + y2) * 0.5) * self._inv_half_wh[1] - 1.0
+        
+        # previous is the scratch intruder - all its fields were read above
+        return previous.update(
+            bbox=bbox,
+            center_x=float(center_x),
+            center_y=float(center_y),
+            distance=distance,
+            confidence=previous.confidence,
+            timestamp=current_time + self._wall_clock_offset
+        )
+    
     def _detect_intruder(
         self,
         color_frame: np.ndarray,
-        depth_frame: Optional[np.ndarray]
+        depth_frame: Optional[np.ndarray],
+        current_time: float
     ) -> Optional[Intruder]:
         """
         Detect intruder in frame.
@@ -216,78 +454,249 @@ class PatrolMode(BaseMode):
         Returns:
             Intruder object if detected, None otherwise
         """
-        # Run object detection
-        result = self.object_detector.detect(color_frame, depth_frame)
+        result, depth_frame = self._run_detection(
+            color_frame, depth_frame, self.config.async_detection
+        )
+        prepared = self._prepare_candidates(result, depth_frame)
+        if prepared is None:
+            return None
+        boxes, depths, candidates = prepared
         
-        if result is None or result.objects is None:
+        best, _ = score_persons(
+            boxes, result.scores, depths, candidates,
+            self.config.min_confidence,
+            self.config.min_box_area,
+            self.config.alert_distance
+        )
+        if best < 0:
             return None
         
-        frame_h, frame_w = color_frame.shape[:2]
-        best_intruder = None
-        best_score = 0
+        # Fill the scratch Intruder only for the winning detection
+        return self._fill_intruder(
+            self._scratch_intruder, color_frame, boxes[best], float(depths[best]),
+            result.objects[best].confidence, current_time
+        )
+    
+    def detect_intruders_multi(
+        self,
+        color_frames: List[np.ndarray],
+        depth_frames: Optional[List[Optional[np.ndarray]]] = None
+    ) -> List[Optional[Intruder]]:
+        """
+        Detect the intruder in each of several camera streams.
         
-        for det in result.objects:
-            # Check class
-            if det.class_name != self.config.detect_class:
-                continue
-            
-            # Check confidence
-            if det.confidence < self.config.min_confidence:
-                continue
-            
-            # Get bbox - DetectedObject uses bbox tuple (x1, y1, x2, y2)
-            x1, y1, x2, y2 = det.bbox
-            
-            # Check box area
-            box_area = (x2 - x1) * (y2 - y1)
-            if box_area < self.config.min_box_area:
-                continue
-            
-            # Get distance - DetectedObject uses 'depth' attribute
-            distance = det.depth if det.depth > 0 else float('inf')
+        Detection runs per frame, then the candidates of all cameras are
+        scored together in one parallel kernel (one camera per thread).
+        Does not touch the patrol state machine.
+        
+        Args:
+            color_frames: One BGR frame per camera
+            depth_frames: Matching depth frames in meters (optional)
             
-            # Check distance threshold
-            if distance > self.config.alert_distance:
+        Returns:
+            One new Intruder (or None) per camera
+        """
+        current_time = time.monotonic()
+        if depth_frames is None:
+            depth_frames = [None] * len(color_frames)
+        
+        # Per-camera candidates as one structure of arrays plus row offsets
+        prepared = []
+        for color_frame, depth_frame in zip(color_frames, depth_frames):
+            result, depth_frame = self._run_detection(color_frame, depth_frame, False)
+            cam = self._prepare_candidates(result, depth_frame)
+            prepared.append(None if cam is None else (result,) + cam)
+        
+        rows = [p for p in prepared if p is not None]
+        if not rows:
+            return [None] * len(color_frames)
+        
+        counts = [0 if p is None else len(p[1]) for p in prepared]
+        offsets = np.zeros(len(prepared) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        
+        best_idx, _ = score_persons_multi(
+            np.concatenate([p[1] for p in rows]),
+            np.concatenate([p[0].scores for p in rows]),
+            np.concatenate([p[2] for p in rows]),
+            np.concatenate([p[3] for p in rows]),
+            offsets,
+            self.config.min_confidence,
+            self.config.min_box_area,
+            self.config.alert_distance
+        )
+        
+        # Demultiplex back to one Intruder per camera
+        intruders: List[Optional[Intruder]] = []
+        for cam, (color_frame, cam_prepared) in enumerate(zip(color_frames, prepared)):
+            best = int(best_idx[cam])
+            if best < 0:
+                intruders.append(None)
                 continue
-            
-            # Calculate score (closer + more confident = better)
-            score = det.confidence * (1.0 / (distance + 0.1))
-            
-            if score > best_score:
-                best_score = score
-                
-                # Calculate normalized center
-                center_x = (x1 + x2) / 2
-                center_y = (y1 + y2) / 2
-                norm_x = (center_x - frame_w / 2) / (frame_w / 2)  # -1 to 1
-                norm_y = (center_y - frame_h / 2) / (frame_h / 2)  # -1 to 1
-                
-                best_intruder = Intruder(
-                    bbox=(x1, y1, x2, y2),
-                    center_x=norm_x,
-                    center_y=norm_y,
-                    distance=distance,
-                    confidence=det.confidence,
-                    timestamp=time.time()
-                )
+            result, boxes, depths, _ = cam_prepared
+            i = best - offsets[cam]
+            intruders.append(self._fill_intruder(
+                Intruder((0, 0, 0, 0), 0.0, 0.0, 0.0, 0.0, 0.0), color_frame,
+                boxes[i], float(depths[i]), result.objects[i].confidence, current_time
+            ))
+        return intruders
+    
+    def _run_detection(
+        self,
+        color_frame: np.ndarray,
+        depth_frame: Optional[np.ndarray],
+        pipelined: bool
+    ):
+        """
+        Run object detection at detection resolution (without depth -
+        _prepare_candidates samples it for candidates only).
+        
+        Returns:
+            (detection result or None, depth frame the result belongs to)
+        """
+        det_frame = self._get_detection_frame(color_frame)
+        if pipelined:
+            return self._detect_pipelined(det_frame, depth_frame)
+        result = self.object_detector.detect(
+            det_frame, classes=self._detect_class_ids
+        )
+        return result, depth_frame
+    
+    def _prepare_candidates(
+        self,
+        result,
+        depth_frame: Optional[np.ndarray]
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Turn a detection result into score_persons inputs.
+        
+        Returns:
+            (full-resolution boxes, depths, candidate mask), or None if
+            no detection passes the class/confidence/area filters
+        """
+        if result is None or not result.objects or result.boxes is None:
+            return None
+        
+        # Boxes back to full-resolution pixels
+        boxes = result.boxes
+        if self._det_scale != 1.0:
+            boxes = np.rint(boxes * self._det_scale).astype(np.int32)
+        
+        # Intruder class mask (IDs when known, else compare names)
+        if self._detect_class_ids is not None:
+            person_mask = np.isin(result.class_ids, self._detect_class_ids)
+        else:
+            person_mask = np.array(
+                [det.class_name == self.config.detect_class for det in result.objects],
+                dtype=np.bool_
+            )
         
-        return best_intruder
+        # Cheap filters first, then depth only inside the surviving boxes
+        areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+        candidates = (
+            person_mask &
+            (result.scores >= self.config.min_confidence) &
+            (areas >= self.config.min_box_area)
+        )
+        if not candidates.any():
+            return None
+        
+        depths = result.depths.copy()
+        depths[candidates] = self.object_detector.measure_depths(depth_frame, boxes[candidates])
+        return boxes, depths, candidates
+    
+    def _fill_intruder(
+        self,
+        intruder: Intruder,
+        color_frame: np.ndarray,
+        box: np.ndarray,
+        distance: float,
+        confidence: float,
+        current_time: float
+    ) -> Intruder:
+        """Write a detection into intruder (center normalized to -1..1)."""
+        if color_frame.shape[:2] != self._norm_frame_shape:
+            frame_h, frame_w = color_frame.shape[:2]
+            self._norm_frame_shape = (frame_h, frame_w)
+            self._inv_half_wh = np.array([2.0 / frame_w, 2.0 / frame_h])
+        norm_x, norm_y = (box[:2] + box[2:]) * 0.5 * self._inv_half_wh - 1.0
+        
+        return intruder.update(
+            bbox=tuple(box.tolist()),
+            center_x=float(norm_x),
+            center_y=float(norm_y),
+            distance=distance,
+            confidence=confidence,
+            timestamp=current_time + self._wall_clock_offset
+        )
+    
+    def _get_detection_frame(self, color_frame: np.ndarray) -> np.ndarray:
+        """
+        Downscale the frame to detection_width once, before the detector.
+        Sets self._det_scale to map detection boxes back to full resolution.
+        """
+        if color_frame.shape[:2] != self._det_frame_shape:
+            frame_h, frame_w = color_frame.shape[:2]
+            self._det_frame_shape = (frame_h, frame_w)
+            if frame_w > self.config.detection_width:
+                scale = self.config.detection_width / frame_w
+                self._det_size = (self.config.detection_width, int(round(frame_h * scale)))
+                self._det_scale = frame_w / self.config.detection_width
+            else:
+                self._det_size = None
+                self._det_scale = 1.0
+        
+        if self._det_size is None:
+            return color_frame
+        if cv2.ocl.useOpenCL():
+            # Resize on the OpenCL device (see ROBOT_CV_OPENCL in base_mode)
+            return cv2.resize(
+                cv2.UMat(color_frame), self._det_size, interpolation=cv2.INTER_LINEAR
+            ).get()
+        return cv2.resize(color_frame, self._det_size, interpolation=cv2.INTER_LINEAR)
     
-    def _trigger_alert(self, intruder: Intruder) -> None:
+    def _detect_pipelined(
+        self,
+        color_frame: np.ndarray,
+        depth_frame: Optional[np.ndarray]
+    ):
+        """
+        Start detection on this frame and return the previous frame's job.
+        
+        Returns:
+            (detection result, depth frame it belongs to), result is None
+            on the first frame (nothing finished yet)
+        """
+        job = FrameJob(
+            color_frame=color_frame,
+            depth_frame=depth_frame,
+            det_future=self.object_detector.detect_async(
+                color_frame, classes=self._detect_class_ids
+            )
+        )
+        previous, self._pending_job = self._pending_job, job
+        
+        if previous is None:
+            return None, None
+        return previous.det_future.result(), previous.depth_frame
+    
+    def _trigger_alert(self, intruder: Intruder, current_time: float) -> None:
         """Trigger alert when intruder detected."""
-        logger.warning(f"🚨 INTRUDER DETECTED! Distance: {intruder.distance:.1f}m")
+        logger.warning("🚨 INTRUDER DETECTED! Distance: %.1fm", intruder.distance)
         
+        # The per-frame intruder is reused, keep a snapshot of this one
+        intruder = copy.copy(intruder)
         self._current_intruder = intruder
         self._intruders_detected.append(intruder)
         self._patrol_state = PatrolState.ALERT
-        self._alert_start_time = time.time()
+        self._alert_start_time = current_time
         
         # Call alert callback if set
         if self._alert_callback:
             try:
                 self._alert_callback(intruder)
             except Exception as e:
-                logger.error(f"Alert callback error: {e}")
+                logger.error("Alert callback error: %s", e)
         
         # Sound alert (placeholder)
         if self.config.enable_sound_alert:
@@ -360,8 +769,7 @@ class PatrolMode(BaseMode):
         self._current_intruder = intruder
         
         # Calculate steering to center intruder
-        yaw_rate = -intruder.center_x * self.config.tracking_gain
-        yaw_rate = np.clip(yaw_rate, -self.max_yaw_rate, self.max_yaw_rate)
+        yaw_rate = self._clamp_yaw_rate(-intruder.center_x * self.config.tracking_gain)
         
         # Calculate velocity based on distance
         distance_error = intruder.distance - self.config.tracking_distance
@@ -452,64 +860,132 @@ class PatrolMode(BaseMode):
         intruder: Optional[Intruder],
         output: ModeOutput
     ) -> np.ndarray:
-        """Create visualization overlay."""
-        viz = frame.copy()
+        """
+        Create visualization overlay.
+        
+        Draws into a buffer reused across frames (the camera frame itself is
+        never modified), so the returned image is only valid until the next
+        process() call.
+        """
+        if self._viz_buffer is None or self._viz_buffer.shape != frame.shape:
+            self._viz_buffer = np.empty_like(frame)
+        np.copyto(self._viz_buffer, frame)
+        viz = self._viz_buffer
         h, w = viz.shape[:2]
         
-        # Determine color based on state
-        if self._patrol_state in (PatrolState.ALERT, PatrolState.TRACKING):
-            color = self.config.alert_color
-            status = "🚨 INTRUDER DETECTED!"
-        else:
-            color = self.config.normal_color
-            status = "Patrolling..."
-        
-        # Draw status bar
-        cv2.rectangle(viz, (0, 0), (w, 40), color, -1)
-        cv2.putText(
-            viz, status,
-            (10, 28), cv2.FONT_HERSHEY_SIMPLEX, 0.8,
-            (255, 255, 255), 2
-        )
+        # Status bar (two cached variants: normal / alert)
+        alert = self._patrol_state in (PatrolState.ALERT, PatrolState.TRACKING)
+        bar = self._get_status_bar(alert, w)
+        viz[:bar.shape[0]] = bar
         
-        # Draw intruder bounding box
+        # Draw intruder bounding box (moves every frame)
         if intruder is not None:
             x1, y1, x2, y2 = intruder.bbox
             cv2.rectangle(viz, (x1, y1), (x2, y2), self.config.alert_color, 3)
             
             # Draw distance label
             label = f"INTRUDER {intruder.distance:.1f}m"
-            cv2.putText(
-                viz, label,
-                (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.7,
-                self.config.alert_color, 2
-            )
+            self._draw_text(viz, label, (x1, y1 - 10), 0.7, self.config.alert_color, 2)
         
-        # Draw patrol info
+        # Draw patrol info (cached strip, blitted through its text mask)
         info_y = h - 80
-        cv2.putText(
-            viz, f"State: {self._patrol_state.name}",
-            (10, info_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5,
-            (255, 255, 255), 1
-        )
-        cv2.putText(
-            viz, f"Cycle: {self._patrol_cycle}",
-            (10, info_y + 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5,
-            (255, 255, 255), 1
-        )
-        cv2.putText(
-            viz, f"Intruders: {len(self._intruders_detected)}",
-            (10, info_y + 40), cv2.FONT_HERSHEY_SIMPLEX, 0.5,
-            (255, 255, 255), 1
-        )
-        cv2.putText(
-            viz, output.message,
-            (10, info_y + 60), cv2.FONT_HERSHEY_SIMPLEX, 0.5,
-            (200, 200, 200), 1
-        )
+        strip_top = info_y - 15
+        strip, mask = self._get_info_strip(w)
+        np.copyto(viz[strip_top:strip_top + strip.shape[0]], strip, where=mask)
+        self._draw_text(viz, output.message, (10, info_y + 60), 0.5, (200, 200, 200), 1)
         
         return viz
     
+    def _draw_text(
+        self,
+        viz: np.ndarray,
+        text: str,
+        org: Tuple[int, int],
+        scale: float,
+        color: Tuple[int, int, int],
+        thickness: int
+    ) -> None:
+        """
+        Same output as cv2.putText (FONT_HERSHEY_SIMPLEX), but each string is
+        rasterized once and later calls only write its stroke pixels.
+        """
+        key = (text, scale, thickness)
+        cached = self._text_mask_cache.get(key)
+        if cached is None:
+            if len(self._text_mask_cache) >= _TEXT_MASK_CACHE_MAX:
+                self._text_mask_cache.clear()
+            (text_w, text_h), baseline = cv2.getTextSize(
+                text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness
+            )
+            pad = 2 * thickness + 4
+            mask = np.zeros((text_h + baseline + 2 * pad, text_w + 2 * pad), dtype=np.uint8)
+            cv2.putText(
+                mask, text, (pad, pad + text_h),
+                cv2.FONT_HERSHEY_SIMPLEX, scale, 255, thickness
+            )
+            rows, cols = np.nonzero(mask)
+            cached = (rows, cols, mask.shape, pad, pad + text_h)
+            self._text_mask_cache[key] = cached
+        
+        rows, cols, (mask_h, mask_w), ox, oy = cached
+        x0, y0 = org[0] - ox, org[1] - oy
+        h, w = viz.shape[:2]
+        
+        # putText clips strokes slightly differently than cropping the mask
+        # would, so text crossing the frame edge is drawn directly
+        if x0 < 0 or y0 < 0 or x0 + mask_w > w or y0 + mask_h > h:
+            cv2.putText(viz, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+            return
+        
+        viz[y0:y0 + mask_h, x0:x0 + mask_w][rows, cols] = color
+    
+    def _get_status_bar(self, alert: bool, width: int) -> np.ndarray:
+        """Get the pre-rendered top status bar for the given state."""
+        key = (alert, width)
+        bar = self._status_bar_cache.get(key)
+        if bar is None:
+            if alert:
+                color = self.config.alert_color
+                status = "🚨 INTRUDER DETECTED!"
+            else:
+                color = self.config.normal_color
+                status = "Patrolling..."
+            
+            # Same rows as cv2.rectangle((0, 0), (w, 40)) - both corners inclusive
+            bar = np.empty((41, width, 3), dtype=np.uint8)
+            bar[:] = color
+            cv2.putText(
+                bar, status,
+                (10, 28), cv2.FONT_HERSHEY_SIMPLEX, 0.8,
+                (255, 255, 255), 2
+            )
+            self._status_bar_cache[key] = bar
+        return bar
+    
+    def _get_info_strip(self, width: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the pre-rendered patrol info lines and their pixel mask.
+        Re-rendered only when state, cycle or intruder count changes.
+        """
+        key = (self._patrol_state, self._patrol_cycle, len(self._intruders_detected), width)
+        if key != self._info_strip_key:
+            strip = np.zeros((60, width, 3), dtype=np.uint8)
+            lines = (
+                f"State: {self._patrol_state.name}",
+                f"Cycle: {self._patrol_cycle}",
+                f"Intruders: {len(self._intruders_detected)}",
+            )
+            for i, text in enumerate(lines):
+                cv2.putText(
+                    strip, text,
+                    (10, 15 + i * 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5,
+                    (255, 255, 255), 1
+                )
+            self._info_strip = strip
+            self._info_strip_mask = strip.any(axis=2, keepdims=True)
+            self._info_strip_key = key
+        return self._info_strip, self._info_strip_mask
+    
     def _create_stop_output(self, message: str) -> ModeOutput:
         """Create stop output with message."""
         return ModeOutput(
@@ -6,12 +6,70 @@ Handles RGB and Depth stream acquisition with proper alignment.
 import numpy as np
 import pyrealsense2 as rs
 import logging
-from typing import Optional, Tuple
+import threading
+import time
+from typing import List, Optional, Tuple
 
 from src.core import config
+from .depth_kernels import (
+    scale_depth, median_valid_depth, median_valid_depths, bilateral_luts, joint_bilateral_depth,
+    CUDA_AVAILABLE
+)
 
 logger = logging.getLogger(__name__)
 
+# Frame buffers start on a cache line so SIMD kernels (OpenCV, numba) and
+# DMA copies never straddle lines at the first row
+BUFFER_ALIGNMENT = 64
+
+
+def _aligned_empty(shape: Tuple[int, ...], dtype, align: int = BUFFER_ALIGNMENT) -> np.ndarray:
+    """Uninitialized array whose data pointer is a multiple of align bytes."""
+    nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    raw = np.empty(nbytes + align, dtype=np.uint8)
+    offset = (-raw.ctypes.data) % align
+    arr = raw[offset:offset + nbytes].view(dtype).reshape(shape)
+    assert arr.ctypes.data % align == 0
+    return arr
+
+
+def _plane_align_maps(color_intrinsics, depth_intrinsics, color_to_depth, plane_depth: float):
+    """
+    Remap tables that align depth to color for a scene at a single depth.
+
+    Every color pixel is projected onto the plane Z = plane_depth, moved
+    into the depth camera frame and projected onto the depth image. Pixels
+    at other depths are off by about fx * baseline * |1/Z - 1/plane_depth|
+    (a few pixels for the D435i's ~15 mm color-depth baseline).
+
+    Args:
+        color_intrinsics, depth_intrinsics: rs.intrinsics of both streams
+        color_to_depth: rs.extrinsics from the color to the depth stream
+        plane_depth: Depth the tables are exact for (meters)
+
+    Returns:
+        (map1, map2) for cv2.remap with INTER_NEAREST, sized like the color image
+    """
+    import cv2
+
+    ci, di = color_intrinsics, depth_intrinsics
+    xs, ys = np.meshgrid(
+        np.arange(ci.width, dtype=np.float32),
+        np.arange(ci.height, dtype=np.float32)
+    )
+    points = np.empty((ci.height, ci.width, 3), dtype=np.float32)
+    points[..., 0] = (xs - ci.ppx) / ci.fx * plane_depth
+    points[..., 1] = (ys - ci.ppy) / ci.fy * plane_depth
+    points[..., 2] = plane_depth
+
+    # librealsense stores the rotation column-major
+    rotation = np.asarray(color_to_depth.rotation, dtype=np.float32).reshape(3, 3).T
+    points = points @ rotation.T + np.asarray(color_to_depth.translation, dtype=np.float32)
+
+    map_x = points[..., 0] / points[..., 2] * di.fx + di.ppx
+    map_y = points[..., 1] / points[..., 2] * di.fy + di.ppy
+    return cv2.convertMaps(map_x, map_y, cv2.CV_16SC2, nninterpolation=True)
+
 
 class RealSenseCamera:
     """
@@ -23,7 +81,8 @@ class RealSenseCamera:
         self,
         width: int = None,
         height: int = None,
-        fps: int = None
+        fps: int = None,
+        threaded: bool = None
     ):
         """
         Initialize the RealSense camera.
@@ -32,16 +91,25 @@ class RealSenseCamera:
             width: Frame width in pixels (default from config)
             height: Frame height in pixels (default from config)
             fps: Frames per second (default from config)
+            threaded: Capture on a background thread (default from config)
         """
         self.width = width or config.CAMERA_WIDTH
         self.height = height or config.CAMERA_HEIGHT
         self.fps = fps or config.CAMERA_FPS
+        self.threaded = config.CAMERA_THREADED_CAPTURE if threaded is None else threaded
 
         self.pipeline: Optional[rs.pipeline] = None
         self.rs_config: Optional[rs.config] = None
         self.align: Optional[rs.align] = None
         self.depth_scale: float = 0.001  # Default depth scale
         self.intrinsics = None  # Camera intrinsics
+        # (fx, fy, ppx, ppy) when the intrinsics have no distortion, so
+        # deprojection is plain pinhole math (None = use librealsense)
+        self._pinhole: Optional[Tuple[float, float, float, float]] = None
+        # Depth-to-color remap tables when config.CAMERA_FAST_ALIGN is on
+        # (None = use rs.align) and the remapped raw depth scratch buffer
+        self._align_maps: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._align_scratch: Optional[np.ndarray] = None
 
         self._is_running = False
         self._consecutive_failures = 0
@@ -49,6 +117,34 @@ class RealSenseCamera:
         self._frame_timeout_ms = getattr(config, 'CAMERA_FRAME_TIMEOUT_MS', 1500)
         self._warmup_frames = getattr(config, 'CAMERA_WARMUP_FRAMES', 10)
 
+        # Depth-in-meters output buffers, used alternately so the previous
+        # frame's depth stays valid while the next one is converted
+        self._depth_buffers: List[np.ndarray] = []
+        self._depth_buffer_index = 0
+
+        # Undistortion remap tables (built once per calibration/resolution)
+        # and alternating output buffers, like the depth buffers
+        self._undistort_key = None
+        self._undistort_maps: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._undistort_buffers: List[np.ndarray] = []
+        self._undistort_buffer_index = 0
+
+        # Joint bilateral depth filter: weight tables (rebuilt when the filter
+        # settings change) and the unfiltered-depth scratch buffer
+        self._depth_filter_key = None
+        self._depth_filter_luts: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._cuda_depth_filter = None  # CudaJointBilateral for the current LUTs
+        self._depth_scratch: Optional[np.ndarray] = None
+
+        # Threaded capture: latest converted frame pair plus a sequence number
+        # so get_frames never returns the same frame twice
+        self._capture_thread: Optional[threading.Thread] = None
+        self._capture_running = False
+        self._frame_cond = threading.Condition()
+        self._latest: Tuple[Optional[np.ndarray], Optional[np.ndarray]] = (None, None)
+        self._latest_seq = 0
+        self._read_seq = 0
+
     def start(self) -> bool:
         """
         Start the camera streams.
@@ -92,9 +188,34 @@ class RealSenseCamera:
             color_profile = profile.get_stream(rs.stream.color)
             self.intrinsics = color_profile.as_video_stream_profile().get_intrinsics()
             logger.info(f"Camera intrinsics: fx={self.intrinsics.fx:.2f}, fy={self.intrinsics.fy:.2f}")
+            if any(self.intrinsics.coeffs):
+                self._pinhole = None
+            else:
+                self._pinhole = (
+                    self.intrinsics.fx, self.intrinsics.fy,
+                    self.intrinsics.ppx, self.intrinsics.ppy
+                )
 
             # Create alignment object (align depth to color)
             self.align = rs.align(rs.stream.color)
+            self._align_maps = None
+            if config.CAMERA_FAST_ALIGN:
+                depth_profile = profile.get_stream(rs.stream.depth)
+                self._align_maps = _plane_align_maps(
+                    self.intrinsics,
+                    depth_profile.as_video_stream_profile().get_intrinsics(),
+                    color_profile.get_extrinsics_to(depth_profile),
+                    config.CAMERA_FAST_ALIGN_DEPTH
+                )
+                logger.info(
+                    "Fast depth alignment: remap for a plane at %.2f m",
+                    config.CAMERA_FAST_ALIGN_DEPTH
+                )
+
+            # Aligned depth has the color stream resolution
+            self._depth_buffers = [
+                _aligned_empty((self.height, self.width), np.float32) for _ in range(2)
+            ]
 
             self._is_running = True
             self._consecutive_failures = 0
@@ -107,6 +228,14 @@ class RealSenseCamera:
                 except Exception:
                     pass
             
+            if self.threaded:
+                self._capture_running = True
+                self._capture_thread = threading.Thread(
+                    target=self._capture_loop,
+                    daemon=True
+                )
+                self._capture_thread.start()
+            
             logger.info("RealSense camera started successfully")
             return True
 
@@ -117,50 +246,70 @@ class RealSenseCamera:
 
     def stop(self) -> None:
         """Stop the camera streams."""
+        # Capture thread first, it may be blocked in wait_for_frames
+        self._capture_running = False
+        if self._capture_thread is not None:
+            self._capture_thread.join(timeout=self._frame_timeout_ms / 1000.0 + 0.5)
+            self._capture_thread = None
+        
         if self.pipeline is not None and self._is_running:
             self.pipeline.stop()
             self._is_running = False
             logger.info("RealSense camera stopped")
 
-    def get_frames(self) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+    def get_frames(self, align: bool = True) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
         """
         Get synchronized RGB and depth frames.
 
+        Args:
+            align: Align depth to the color frame. Alignment is the most
+                expensive step on CPU; pass False when depth is not used or
+                not needed per color pixel. Ignored with threaded capture,
+                which always aligns.
+
         Returns:
             Tuple of (color_frame, depth_frame) as numpy arrays.
             depth_frame is in meters.
             Returns (None, None) if frames unavailable.
+
+        Note:
+            depth_frame (and color_frame when intrinsic calibration is
+            enabled) are reused buffers. They stay valid through the next
+            get_frames() call and are overwritten by the one after that, so
+            copy them if they must be kept longer. With threaded capture
+            every frame pair is a new array and can be kept.
+
+            Unaligned depth is in the depth sensor's own pixel grid: it is
+            not color-filtered, and pixel_to_point() (color intrinsics)
+            does not apply to it - use the depth stream intrinsics instead.
         """
-        if not self._is_running or self.pipeline is None:
+        pipeline = self.pipeline
+        if not self._is_running or pipeline is None:
             return None, None
 
-        try:
-            # Wait for frames with shorter timeout
-            frames = self.pipeline.wait_for_frames(timeout_ms=self._frame_timeout_ms)
+        if self.threaded:
+            return self._get_latest_frames()
 
-            # Align depth to color frame
-            aligned_frames = self.align.process(frames)
+        # Timeouts are routine under load - report them without raising
+        ok, frames = pipeline.try_wait_for_frames(self._frame_timeout_ms)
+        if not ok:
+            self._consecutive_failures += 1
+            logger.warning("Frame timeout (%d/%d)", self._consecutive_failures, self._max_failures)
+            return self._handle_failure()
 
-            # Get aligned frames
-            color_frame = aligned_frames.get_color_frame()
-            depth_frame = aligned_frames.get_depth_frame()
+        try:
+            if align and self._align_maps is None:
+                # Align depth to color frame
+                frames = self.align.process(frames)
+            color_image, depth_meters = self._convert_frames(
+                frames, own_arrays=False, aligned=align
+            )
 
-            if not color_frame or not depth_frame:
+            if color_image is None:
                 self._consecutive_failures += 1
-                logger.warning(f"Incomplete frame ({self._consecutive_failures}/{self._max_failures})")
+                logger.warning("Incomplete frame (%d/%d)", self._consecutive_failures, self._max_failures)
                 return self._handle_failure()
 
-            # Convert to numpy arrays
-            color_image = np.asanyarray(color_frame.get_data())
-            depth_image = np.asanyarray(depth_frame.get_data())
-
-            # Convert depth to meters
-            depth_meters = depth_image.astype(np.float32) * self.depth_scale
-            
-            # Apply camera intrinsic calibration if enabled
-            if config.CAMERA_INTRINSIC_ENABLED and config.CAMERA_MATRIX is not None:
-                color_image = self.apply_camera_calibration(color_image)
-
             # Reset failure counter on success
             self._consecutive_failures = 0
             
@@ -168,9 +317,174 @@ class RealSenseCamera:
 
         except Exception as e:
             self._consecutive_failures += 1
-            logger.warning(f"Frame error ({self._consecutive_failures}/{self._max_failures}): {e}")
+            logger.warning("Frame error (%d/%d): %s", self._consecutive_failures, self._max_failures, e)
+            return self._handle_failure()
+
+    def _convert_frames(
+        self,
+        aligned_frames,
+        own_arrays: bool,
+        aligned: bool = True
+    ) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Aligned frameset to (color BGR, depth in meters).
+
+        Args:
+            aligned_frames: Frameset after alignment (raw frameset when the
+                fast remap alignment is used - it is applied here)
+            own_arrays: Return new arrays instead of reused buffers and
+                views of librealsense memory (for threaded capture)
+            aligned: False if depth was not aligned to color (the color
+                guided depth filter is skipped then)
+
+        Returns:
+            (color_image, depth_meters), (None, None) if a frame is missing
+        """
+        color_frame = aligned_frames.get_color_frame()
+        depth_frame = aligned_frames.get_depth_frame()
+
+        if not color_frame or not depth_frame:
+            return None, None
+
+        # Convert to numpy arrays
+        color_image = np.asanyarray(color_frame.get_data())
+        depth_image = np.asanyarray(depth_frame.get_data())
+        if aligned and self._align_maps is not None:
+            depth_image = self._remap_depth(depth_image, scratch=True)
+
+        # Convert depth to meters into a preallocated buffer (no temporaries)
+        if own_arrays:
+            depth_out = _aligned_empty(depth_image.shape, np.float32)
+        else:
+            depth_out = self._next_depth_buffer(depth_image.shape)
+        
+        if config.DEPTH_FILTER_ENABLED and aligned:
+            # Guided by the color image before undistortion - that is the
+            # image depth is aligned to
+            unfiltered = scale_depth(
+                depth_image, self.depth_scale, self._get_depth_scratch(depth_image.shape)
+            )
+            depth_meters = self._filter_depth(unfiltered, color_image, depth_out)
+        else:
+            depth_meters = scale_depth(depth_image, self.depth_scale, depth_out)
+        
+        # Apply camera intrinsic calibration if enabled
+        if config.CAMERA_INTRINSIC_ENABLED and config.CAMERA_MATRIX is not None:
+            color_image = self.apply_camera_calibration(color_image)
+
+        if own_arrays:
+            # Releases the librealsense frame (or undistort buffer) right away
+            color_image = color_image.copy()
+
+        return color_image, depth_meters
+
+    def _get_depth_scratch(self, shape: Tuple[int, int]) -> np.ndarray:
+        """Buffer for unfiltered depth (never returned to callers)."""
+        if self._depth_scratch is None or self._depth_scratch.shape != shape:
+            self._depth_scratch = _aligned_empty(shape, np.float32)
+        return self._depth_scratch
+
+    def _filter_depth(
+        self,
+        depth_meters: np.ndarray,
+        color_image: np.ndarray,
+        out: np.ndarray
+    ) -> np.ndarray:
+        """Apply the joint bilateral depth filter with the configured settings."""
+        key = (
+            config.DEPTH_FILTER_RADIUS,
+            config.DEPTH_FILTER_SIGMA_SPATIAL,
+            config.DEPTH_FILTER_SIGMA_RANGE
+        )
+        if key != self._depth_filter_key:
+            self._depth_filter_luts = bilateral_luts(*key)
+            self._depth_filter_key = key
+            self._cuda_depth_filter = None
+        
+        spatial_lut, range_lut = self._depth_filter_luts
+        if config.DEPTH_FILTER_USE_CUDA and CUDA_AVAILABLE:
+            if self._cuda_depth_filter is None:
+                from .depth_kernels import CudaJointBilateral
+                self._cuda_depth_filter = CudaJointBilateral(spatial_lut, range_lut)
+            return self._cuda_depth_filter(depth_meters, color_image, out)
+        return joint_bilateral_depth(depth_meters, color_image, spatial_lut, range_lut, out)
+
+    def _capture_loop(self) -> None:
+        """Background thread: wait, align and convert, keep only the latest pair."""
+        while self._capture_running:
+            # On timeout get_frames times out too and counts the failure
+            ok, frames = self.pipeline.try_wait_for_frames(self._frame_timeout_ms)
+            if not ok:
+                continue
+
+            try:
+                if self._align_maps is None:
+                    frames = self.align.process(frames)
+                color_image, depth_meters = self._convert_frames(frames, own_arrays=True)
+            except Exception as e:
+                logger.debug("Capture thread frame error: %s", e)
+                time.sleep(0.01)
+                continue
+
+            if color_image is None:
+                continue
+
+            # Older unread frames are simply replaced (no queue build-up)
+            with self._frame_cond:
+                self._latest = (color_image, depth_meters)
+                self._latest_seq += 1
+                self._frame_cond.notify_all()
+
+    def _get_latest_frames(self) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """Return the newest frame pair from the capture thread (waits for a new one)."""
+        with self._frame_cond:
+            has_new = self._frame_cond.wait_for(
+                lambda: self._latest_seq != self._read_seq,
+                timeout=self._frame_timeout_ms / 1000.0
+            )
+            if has_new:
+                self._read_seq = self._latest_seq
+                latest = self._latest
+
+        if not has_new:
+            self._consecutive_failures += 1
+            logger.warning("Frame timeout (%d/%d)", self._consecutive_failures, self._max_failures)
             return self._handle_failure()
+
+        self._consecutive_failures = 0
+        return latest
     
+    def _remap_depth(self, depth_image: np.ndarray, scratch: bool) -> np.ndarray:
+        """
+        Align raw depth to color with the precomputed plane remap.
+
+        Args:
+            depth_image: (H, W) raw z16 depth from the depth stream
+            scratch: Write into a reused buffer (only valid until the next call)
+
+        Returns:
+            Raw depth in the color pixel grid, 0 where nothing maps
+        """
+        import cv2
+
+        map1, map2 = self._align_maps
+        out = None
+        if scratch:
+            if self._align_scratch is None or self._align_scratch.shape != map1.shape[:2]:
+                self._align_scratch = _aligned_empty(map1.shape[:2], depth_image.dtype)
+            out = self._align_scratch
+        return cv2.remap(
+            depth_image, map1, map2, cv2.INTER_NEAREST,
+            dst=out, borderMode=cv2.BORDER_CONSTANT, borderValue=0
+        )
+
+    def _next_depth_buffer(self, shape: Tuple[int, int]) -> np.ndarray:
+        """Get the depth output buffer not returned by the previous call."""
+        if not self._depth_buffers or self._depth_buffers[0].shape != shape:
+            self._depth_buffers = [_aligned_empty(shape, np.float32) for _ in range(2)]
+        self._depth_buffer_index ^= 1
+        return self._depth_buffers[self._depth_buffer_index]
+
     def _handle_failure(self) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
         """Handle frame acquisition failure with auto-recovery."""
         if self._consecutive_failures >= self._max_failures:
@@ -183,7 +497,6 @@ class RealSenseCamera:
         try:
             logger.info("Restarting camera...")
             self.stop()
-            import time
             time.sleep(0.5)  # Brief pause
             success = self.start()
             if success:
@@ -202,7 +515,7 @@ class RealSenseCamera:
             image: Input image
             
         Returns:
-            Undistorted image
+            Undistorted image (reused buffer, valid through the next call)
         """
         if not config.CAMERA_INTRINSIC_ENABLED or config.CAMERA_MATRIX is None:
             return image
@@ -212,31 +525,53 @@ class RealSenseCamera:
             
             h, w = image.shape[:2]
             
-            # Get optimal camera matrix for undistortion
-            new_camera_matrix, roi = cv2.getOptimalNewCameraMatrix(
-                config.CAMERA_MATRIX, 
-                config.DISTORTION_COEFFICIENTS, 
-                (w, h), 1, (w, h)
-            )
+            # Same maps cv2.undistort builds internally, but only when the
+            # calibration or resolution changes instead of every frame
+            key = (id(config.CAMERA_MATRIX), id(config.DISTORTION_COEFFICIENTS), w, h)
+            if key != self._undistort_key:
+                # Get optimal camera matrix for undistortion
+                new_camera_matrix, roi = cv2.getOptimalNewCameraMatrix(
+                    config.CAMERA_MATRIX, 
+                    config.DISTORTION_COEFFICIENTS, 
+                    (w, h), 1, (w, h)
+                )
+                self._undistort_maps = cv2.initUndistortRectifyMap(
+                    config.CAMERA_MATRIX,
+                    config.DISTORTION_COEFFICIENTS,
+                    None,
+                    new_camera_matrix,
+                    (w, h),
+                    cv2.CV_16SC2
+                )
+                self._undistort_key = key
+            
+            if not self._undistort_buffers or self._undistort_buffers[0].shape != image.shape:
+                self._undistort_buffers = [
+                    _aligned_empty(image.shape, image.dtype) for _ in range(2)
+                ]
+            self._undistort_buffer_index ^= 1
             
             # Undistort image
-            undistorted = cv2.undistort(
-                image, 
-                config.CAMERA_MATRIX, 
-                config.DISTORTION_COEFFICIENTS, 
-                None, 
-                new_camera_matrix
+            map1, map2 = self._undistort_maps
+            undistorted = cv2.remap(
+                image, map1, map2, cv2.INTER_LINEAR,
+                dst=self._undistort_buffers[self._undistort_buffer_index]
             )
             
             return undistorted
             
         except Exception as e:
-            logger.warning(f"Camera calibration failed: {e}")
+            logger.warning("Camera calibration failed: %s", e)
             return image
 
-    def get_raw_frames(self) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+    def get_raw_frames(self, align: bool = False) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
         """
         Get raw frames without depth conversion to meters.
+
+        Args:
+            align: Align depth to the color frame (off by default - it is
+                the most expensive step on CPU). Unaligned depth needs the
+                depth stream intrinsics, not pixel_to_point().
         
         Returns:
             Tuple of (color_frame, raw_depth_frame)
@@ -244,23 +579,30 @@ class RealSenseCamera:
         if not self._is_running or self.pipeline is None:
             return None, None
 
+        ok, frames = self.pipeline.try_wait_for_frames(1000)
+        if not ok:
+            logger.warning("Timed out waiting for raw frames")
+            return None, None
+
         try:
-            frames = self.pipeline.wait_for_frames(timeout_ms=1000)
-            aligned_frames = self.align.process(frames)
+            if align and self._align_maps is None:
+                frames = self.align.process(frames)
 
-            color_frame = aligned_frames.get_color_frame()
-            depth_frame = aligned_frames.get_depth_frame()
+            color_frame = frames.get_color_frame()
+            depth_frame = frames.get_depth_frame()
 
             if not color_frame or not depth_frame:
                 return None, None
 
             color_image = np.asanyarray(color_frame.get_data())
             depth_image = np.asanyarray(depth_frame.get_data())
+            if align and self._align_maps is not None:
+                depth_image = self._remap_depth(depth_image, scratch=False)
 
             return color_image, depth_image
 
         except Exception as e:
-            logger.error(f"Error getting raw frames: {e}")
+            logger.error("Error getting raw frames: %s", e)
             return None, None
 
     def pixel_to_point(
@@ -284,11 +626,54 @@ class RealSenseCamera:
             logger.warning("Camera intrinsics not available")
             return (0.0, 0.0, depth)
         
+        if self._pinhole is not None:
+            fx, fy, ppx, ppy = self._pinhole
+            return ((x - ppx) / fx * depth, (y - ppy) / fy * depth, depth)
+        
         point = rs.rs2_deproject_pixel_to_point(
             self.intrinsics, [x, y], depth
         )
         return tuple(point)
 
+    def pixels_to_points(
+        self,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        depths: np.ndarray
+    ) -> np.ndarray:
+        """
+        Vectorized pixel_to_point for many pixels at once.
+        
+        Args:
+            xs: (N,) pixel x coordinates
+            ys: (N,) pixel y coordinates
+            depths: (N,) depth values in meters
+            
+        Returns:
+            (N, 3) float32 array of (X, Y, Z) in meters
+        """
+        depths = np.asarray(depths, dtype=np.float32)
+        points = np.empty((depths.shape[0], 3), dtype=np.float32)
+        
+        if self.intrinsics is None:
+            logger.warning("Camera intrinsics not available")
+            points[:, :2] = 0.0
+            points[:, 2] = depths
+            return points
+        
+        if self._pinhole is not None:
+            fx, fy, ppx, ppy = self._pinhole
+            points[:, 0] = (np.asarray(xs, dtype=np.float32) - ppx) / fx * depths
+            points[:, 1] = (np.asarray(ys, dtype=np.float32) - ppy) / fy * depths
+            points[:, 2] = depths
+            return points
+        
+        # Distortion model in use - let librealsense undo it per pixel
+        pixels = zip(np.asarray(xs).tolist(), np.asarray(ys).tolist(), depths.tolist())
+        for i, (x, y, d) in enumerate(pixels):
+            points[i] = rs.rs2_deproject_pixel_to_point(self.intrinsics, [x, y], d)
+        return points
+
     def get_depth_at_point(
         self,
         depth_frame: np.ndarray,
@@ -300,8 +685,11 @@ class RealSenseCamera:
         Get depth value at a specific point with median filtering.
 
         Args:
-            depth_frame: Depth frame in meters
-            x: X coordinate
+            depth_frame: Depth frame in meters, or raw uint16 depth (e.g.
+                from get_raw_frames(align=True)) - the result is in meters
+                either way
+            x: X coordinate (in depth_frame pixels: color pixels only if
+                the depth is aligned)
             y: Y coordinate
             filter_size: Size of median filter kernel
 
@@ -328,16 +716,76 @@ class RealSenseCamera:
         if region.size == 0:
             return -1.0
 
-        # Apply median filter
-        valid_depths = region[
-            (region > config.DEPTH_MIN_VALID) & 
-            (region < config.DEPTH_MAX_VALID)
-        ]
+        if depth_frame.dtype == np.uint16:
+            # Raw depth: compare in depth units, convert only the result
+            scale = self.depth_scale
+            depth = median_valid_depth(
+                region, config.DEPTH_MIN_VALID / scale, config.DEPTH_MAX_VALID / scale
+            )
+            return depth * scale if depth > 0 else -1.0
 
-        if valid_depths.size == 0:
-            return -1.0
+        # Median of valid depths in one pass (no mask arrays)
+        return median_valid_depth(region, config.DEPTH_MIN_VALID, config.DEPTH_MAX_VALID)
+
+    def get_depth_at_points(
+        self,
+        depth_frame: np.ndarray,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        filter_size: int = None
+    ) -> np.ndarray:
+        """
+        get_depth_at_point() for many points in one call (one compiled,
+        parallel pass instead of a Python call per point).
+
+        Args:
+            depth_frame: Depth frame in meters, or raw uint16 depth (e.g.
+                from get_raw_frames(align=True))
+            xs: (N,) X coordinates, in depth_frame pixels as for
+                get_depth_at_point()
+            ys: (N,) Y coordinates
+            filter_size: Size of median filter kernel
+
+        Returns:
+            (N,) depths in meters, -1 where invalid
+        """
+        if depth_frame is None:
+            return np.full(len(xs), -1.0)
+
+        half_size = (filter_size or config.DEPTH_MEDIAN_FILTER_SIZE) // 2
+
+        if depth_frame.dtype == np.uint16:
+            # Raw depth: compare in depth units, convert only the results
+            scale = self.depth_scale
+            depths = median_valid_depths(
+                depth_frame, xs, ys, half_size,
+                config.DEPTH_MIN_VALID / scale, config.DEPTH_MAX_VALID / scale
+            )
+            valid = depths > 0
+            depths[valid] *= scale
+            return depths
+
+        return median_valid_depths(
+            depth_frame, xs, ys, half_size, config.DEPTH_MIN_VALID, config.DEPTH_MAX_VALID
+        )
 
-        return float(np.median(valid_depths))
+    def depth_to_meters(self, depth_raw: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Convert raw uint16 depth (get_raw_frames) to float32 meters.
+
+        Raw depth is half the size of depth in meters, so callers that only
+        sample a few points can keep it raw and convert on demand.
+
+        Args:
+            depth_raw: (H, W) uint16 depth units
+            out: Optional (H, W) float32 output buffer
+
+        Returns:
+            Depth in meters (out if given)
+        """
+        if out is None:
+            out = np.empty(depth_raw.shape, dtype=np.float32)
+        return scale_depth(depth_raw, self.depth_scale, out)
 
     @property
     def is_running(self) -> bool:
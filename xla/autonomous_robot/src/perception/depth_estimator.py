@@ -10,6 +10,7 @@ from typing import Tuple, Optional, List
 from dataclasses import dataclass
 
 from src.core import config
+from .depth_kernels import median_valid_depth
 
 logger = logging.getLogger(__name__)
 
@@ -36,7 +37,8 @@ class DepthEstimator:
         self,
         median_filter_size: int = config.DEPTH_MEDIAN_FILTER_SIZE,
         min_valid_depth: float = config.DEPTH_MIN_VALID,
-        max_valid_depth: float = config.DEPTH_MAX_VALID
+        max_valid_depth: float = config.DEPTH_MAX_VALID,
+        box_sample_stride: int = 2
     ):
         """
         Initialize the depth estimator.
@@ -45,10 +47,12 @@ class DepthEstimator:
             median_filter_size: Size of median filter for noise reduction
             min_valid_depth: Minimum valid depth value (meters)
             max_valid_depth: Maximum valid depth value (meters)
+            box_sample_stride: Pixel stride for box depth statistics (1 = every pixel)
         """
         self.median_filter_size = median_filter_size
         self.min_valid_depth = min_valid_depth
         self.max_valid_depth = max_valid_depth
+        self.box_sample_stride = max(1, box_sample_stride)
         
         # Depth calibration parameters from config
         self.calibration_enabled = config.DEPTH_CALIBRATION_ENABLED
@@ -184,16 +188,10 @@ class DepthEstimator:
             x - half_size:x + half_size + 1
         ]
 
-        # Filter valid depth values
-        valid_depths = region[
-            (region > self.min_valid_depth) &
-            (region < self.max_valid_depth)
-        ]
-
-        if valid_depths.size == 0:
+        # Median of the valid depths, selected without a mask copy or sort
+        depth = median_valid_depth(region, self.min_valid_depth, self.max_valid_depth)
+        if depth < 0:
             return -1.0
-
-        depth = float(np.median(valid_depths))
         
         # Apply calibration correction
         depth = self.apply_calibration(depth)
@@ -228,8 +226,9 @@ class DepthEstimator:
         y1 = max(0, min(h - 1, y1))
         y2 = max(0, min(h, y2))
 
-        # Extract box region
-        region = depth_frame[y1:y2, x1:x2]
+        # Extract box region (subsampled - depth is smooth inside a box)
+        step = self.box_sample_stride
+        region = depth_frame[y1:y2:step, x1:x2:step]
 
         if region.size == 0:
             return -1.0, -1.0, -1.0
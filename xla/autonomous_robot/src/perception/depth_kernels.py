@@ -0,0 +1,434 @@
+"""
+Depth Kernels - Compiled per-pixel loops for the depth pipeline.
+Each kernel makes a single pass over the data without temporary arrays.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op decorator when numba is not installed."""
+        def decorator(func):
+            return func
+        return decorator
+
+# GPU path for the bilateral filter (Jetson / desktop CUDA)
+try:
+    from numba import cuda
+    CUDA_AVAILABLE = cuda.is_available()
+except Exception:
+    CUDA_AVAILABLE = False
+
+
+@njit(parallel=True, cache=True)
+def _scale_depth_kernel(raw: np.ndarray, scale: np.float32, out: np.ndarray) -> None:
+    """Raw z16 depth to meters, rows split across threads."""
+    for y in prange(raw.shape[0]):
+        for x in range(raw.shape[1]):
+            out[y, x] = np.float32(raw[y, x]) * scale
+
+
+@njit(cache=True)
+def _select_kth(values: np.ndarray, n: int, k: int):
+    """
+    Quickselect: reorder values[:n] in place so values[k] is the k-th
+    smallest, everything before it <= and everything after it >=.
+    """
+    lo = 0
+    hi = n - 1
+    while lo < hi:
+        pivot = values[(lo + hi) // 2]
+        i = lo
+        j = hi
+        while i <= j:
+            while values[i] < pivot:
+                i += 1
+            while values[j] > pivot:
+                j -= 1
+            if i <= j:
+                tmp = values[i]
+                values[i] = values[j]
+                values[j] = tmp
+                i += 1
+                j -= 1
+        if k <= j:
+            hi = j
+        elif k >= i:
+            lo = i
+        else:
+            break
+    return values[k]
+
+
+@njit(cache=True)
+def _median_first_n(values: np.ndarray, count: int) -> float:
+    """Median of values[:count] (reordered in place), -1 if count is 0."""
+    if count == 0:
+        return -1.0
+
+    # Median by selection instead of a full sort (same result as np.median)
+    k = count // 2
+    upper = _select_kth(values, count, k)
+    if count % 2 == 1:
+        return upper
+    lower = values[0]
+    for i in range(1, k):
+        if values[i] > lower:
+            lower = values[i]
+    # Largest value left of k is the lower middle
+    return (lower + upper) * 0.5
+
+
+@njit(cache=True)
+def _median_valid_kernel(region: np.ndarray, min_valid: float, max_valid: float) -> float:
+    """Median of values strictly inside (min_valid, max_valid), -1 if none."""
+    values = np.empty(region.size, dtype=region.dtype)
+    count = 0
+    for y in range(region.shape[0]):
+        for x in range(region.shape[1]):
+            v = region[y, x]
+            if v > min_valid and v < max_valid:
+                values[count] = v
+                count += 1
+    return _median_first_n(values, count)
+
+
+@njit(parallel=True, cache=True)
+def _median_valid_points_kernel(
+    depth: np.ndarray,
+    xs: np.ndarray,
+    ys: np.ndarray,
+    half: int,
+    min_valid: float,
+    max_valid: float,
+    out: np.ndarray
+) -> None:
+    """_median_valid_kernel for a window around each point, points split across threads."""
+    h, w = depth.shape
+    n = xs.shape[0]
+    # One scratch row per point, allocated once outside the parallel loop
+    scratch = np.empty((n, (2 * half + 1) * (2 * half + 1)), dtype=depth.dtype)
+    for i in prange(n):
+        x_min = max(0, xs[i] - half)
+        x_max = min(w, xs[i] + half + 1)
+        y_min = max(0, ys[i] - half)
+        y_max = min(h, ys[i] + half + 1)
+
+        values = scratch[i]
+        count = 0
+        for y in range(y_min, y_max):
+            for x in range(x_min, x_max):
+                v = depth[y, x]
+                if v > min_valid and v < max_valid:
+                    values[count] = v
+                    count += 1
+        out[i] = _median_first_n(values, count)
+
+
+def scale_depth(raw: np.ndarray, scale: float, out: np.ndarray) -> np.ndarray:
+    """
+    Convert raw z16 depth to float32 meters into out.
+
+    Args:
+        raw: (H, W) uint16 depth units
+        scale: Meters per depth unit
+        out: (H, W) float32 output buffer
+
+    Returns:
+        out
+    """
+    if NUMBA_AVAILABLE:
+        _scale_depth_kernel(raw, np.float32(scale), out)
+    else:
+        np.multiply(raw, np.float32(scale), out=out, dtype=np.float32)
+    return out
+
+
+def _valid_bounds(dtype: np.dtype, min_valid: float, max_valid: float):
+    """Valid-range limits typed so compiled and NumPy comparisons agree."""
+    if np.issubdtype(dtype, np.integer):
+        # Raw depth units: exact integer bounds (v > 99.5 <=> v > 99), kept
+        # in int64 so limits past the dtype's range do not wrap
+        return np.int64(np.floor(min_valid)), np.int64(np.ceil(max_valid))
+    # Compare in the region's dtype, as NumPy does for float32 arrays
+    return dtype.type(min_valid), dtype.type(max_valid)
+
+
+def median_valid_depth(region: np.ndarray, min_valid: float, max_valid: float) -> float:
+    """
+    Median depth of a small region, ignoring values outside the valid range.
+
+    Args:
+        region: (h, w) depth in meters, or raw integer depth units
+        min_valid: Values <= this are ignored (same units as region)
+        max_valid: Values >= this are ignored (same units as region)
+
+    Returns:
+        Median depth in the units of region, or -1 if no value is valid
+    """
+    min_valid, max_valid = _valid_bounds(region.dtype, min_valid, max_valid)
+
+    if NUMBA_AVAILABLE:
+        return float(_median_valid_kernel(region, min_valid, max_valid))
+
+    # NumPy fallback: one mask, then partition instead of np.median's sort
+    valid_mask = region > min_valid
+    valid_mask &= region < max_valid
+    count = np.count_nonzero(valid_mask)
+    if count == 0:
+        return -1.0
+
+    k = count // 2
+    if count % 2 == 1:
+        return float(np.partition(region[valid_mask], k)[k])
+    parted = np.partition(region[valid_mask], (k - 1, k))
+    # mean() of the two middle values: float32 math for float32 depth, no
+    # uint16 overflow for raw depth
+    return float(parted[k - 1:k + 1].mean())
+
+
+def median_valid_depths(
+    depth: np.ndarray,
+    xs: np.ndarray,
+    ys: np.ndarray,
+    half: int,
+    min_valid: float,
+    max_valid: float
+) -> np.ndarray:
+    """
+    median_valid_depth() of the (2*half+1)^2 window around many points at once.
+
+    Windows are clipped at the frame border; points outside the frame get -1.
+
+    Args:
+        depth: (H, W) depth in meters, or raw integer depth units
+        xs, ys: (N,) integer pixel coordinates
+        half: Window half size
+        min_valid: Values <= this are ignored (same units as depth)
+        max_valid: Values >= this are ignored (same units as depth)
+
+    Returns:
+        (N,) float64 medians in the units of depth, -1 where no value is valid
+    """
+    xs = np.asarray(xs, dtype=np.int64)
+    ys = np.asarray(ys, dtype=np.int64)
+    out = np.empty(xs.shape[0], dtype=np.float64)
+    min_valid, max_valid = _valid_bounds(depth.dtype, min_valid, max_valid)
+
+    if NUMBA_AVAILABLE:
+        _median_valid_points_kernel(depth, xs, ys, half, min_valid, max_valid, out)
+        return out
+
+    h, w = depth.shape
+    for i, (x, y) in enumerate(zip(xs.tolist(), ys.tolist())):
+        # Clamp both ends so windows past the border are empty, not wrapped
+        region = depth[
+            max(0, y - half):max(0, min(h, y + half + 1)),
+            max(0, x - half):max(0, min(w, x + half + 1))
+        ]
+        out[i] = median_valid_depth(region, min_valid, max_valid) if region.size else -1.0
+    return out
+
+
+def bilateral_luts(radius: int, sigma_spatial: float, sigma_range: float):
+    """
+    Weight tables for joint_bilateral_depth.
+
+    Returns:
+        (spatial_lut, range_lut): (2r+1, 2r+1) weights by pixel offset and
+        (766,) weights by summed absolute BGR difference (0..3*255)
+    """
+    offsets = np.arange(-radius, radius + 1, dtype=np.float32)
+    dist2 = offsets[:, None] ** 2 + offsets[None, :] ** 2
+    spatial_lut = np.exp(-dist2 / (2.0 * sigma_spatial ** 2)).astype(np.float32)
+
+    # Mean channel difference, so sigma_range is on the 0-255 intensity scale
+    color_diff = np.arange(3 * 255 + 1, dtype=np.float32) / 3.0
+    range_lut = np.exp(-color_diff ** 2 / (2.0 * sigma_range ** 2)).astype(np.float32)
+    return spatial_lut, range_lut
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def _joint_bilateral_kernel(
+    depth: np.ndarray,
+    color: np.ndarray,
+    spatial_lut: np.ndarray,
+    range_lut: np.ndarray,
+    radius: int,
+    out: np.ndarray
+) -> None:
+    """One pass: each output pixel is a color-weighted mean of valid neighbors."""
+    h, w = depth.shape
+    for y in prange(h):
+        for x in range(w):
+            b0 = np.int32(color[y, x, 0])
+            g0 = np.int32(color[y, x, 1])
+            r0 = np.int32(color[y, x, 2])
+            acc = 0.0
+            weight_sum = 0.0
+            for dy in range(-radius, radius + 1):
+                yy = y + dy
+                if yy < 0 or yy >= h:
+                    continue
+                for dx in range(-radius, radius + 1):
+                    xx = x + dx
+                    if xx < 0 or xx >= w:
+                        continue
+                    d = depth[yy, xx]
+                    if d <= 0:
+                        continue
+                    diff = (abs(np.int32(color[yy, xx, 0]) - b0) +
+                            abs(np.int32(color[yy, xx, 1]) - g0) +
+                            abs(np.int32(color[yy, xx, 2]) - r0))
+                    wgt = spatial_lut[dy + radius, dx + radius] * range_lut[diff]
+                    acc += wgt * d
+                    weight_sum += wgt
+            out[y, x] = acc / weight_sum if weight_sum > 0 else 0.0
+
+
+def joint_bilateral_depth(
+    depth: np.ndarray,
+    color: np.ndarray,
+    spatial_lut: np.ndarray,
+    range_lut: np.ndarray,
+    out: np.ndarray
+) -> np.ndarray:
+    """
+    Edge-preserving depth smoothing guided by the aligned color image.
+
+    Pixels with depth <= 0 are treated as missing: they get no weight, and
+    are filled from valid neighbors of similar color (0 if there are none).
+
+    Args:
+        depth: (H, W) float32 depth in meters
+        color: (H, W, 3) uint8 BGR image aligned with depth
+        spatial_lut, range_lut: Tables from bilateral_luts()
+        out: (H, W) float32 output buffer (must not alias depth)
+
+    Returns:
+        out
+    """
+    radius = spatial_lut.shape[0] // 2
+    if NUMBA_AVAILABLE:
+        _joint_bilateral_kernel(depth, color, spatial_lut, range_lut, radius, out)
+        return out
+
+    # NumPy fallback: one vectorized step per window offset
+    h, w = depth.shape
+    depth_p = np.pad(depth, radius)
+    color_p = np.pad(color, ((radius, radius), (radius, radius), (0, 0))).astype(np.int16)
+    center = color.astype(np.int16)
+    acc = np.zeros((h, w), dtype=np.float32)
+    weight_sum = np.zeros((h, w), dtype=np.float32)
+    for dy in range(2 * radius + 1):
+        for dx in range(2 * radius + 1):
+            d = depth_p[dy:dy + h, dx:dx + w]
+            diff = np.abs(color_p[dy:dy + h, dx:dx + w] - center).sum(axis=2)
+            wgt = spatial_lut[dy, dx] * range_lut[diff]
+            wgt[d <= 0] = 0.0
+            acc += wgt * d
+            weight_sum += wgt
+    np.divide(acc, weight_sum, out=out, where=weight_sum > 0)
+    out[weight_sum <= 0] = 0.0
+    return out
+
+
+if CUDA_AVAILABLE:
+    @cuda.jit
+    def _joint_bilateral_cuda_kernel(depth, color, spatial_lut, range_lut, radius, out):
+        """Same math as _joint_bilateral_kernel, one thread per pixel."""
+        x, y = cuda.grid(2)
+        h, w = depth.shape
+        if y >= h or x >= w:
+            return
+
+        b0 = np.int32(color[y, x, 0])
+        g0 = np.int32(color[y, x, 1])
+        r0 = np.int32(color[y, x, 2])
+        acc = 0.0
+        weight_sum = 0.0
+        for dy in range(-radius, radius + 1):
+            yy = y + dy
+            if yy < 0 or yy >= h:
+                continue
+            for dx in range(-radius, radius + 1):
+                xx = x + dx
+                if xx < 0 or xx >= w:
+                    continue
+                d = depth[yy, xx]
+                if d <= 0:
+                    continue
+                diff = (abs(np.int32(color[yy, xx, 0]) - b0) +
+                        abs(np.int32(color[yy, xx, 1]) - g0) +
+                        abs(np.int32(color[yy, xx, 2]) - r0))
+                wgt = spatial_lut[dy + radius, dx + radius] * range_lut[diff]
+                acc += wgt * d
+                weight_sum += wgt
+        out[y, x] = acc / weight_sum if weight_sum > 0 else 0.0
+
+
+class CudaJointBilateral:
+    """
+    joint_bilateral_depth on the GPU.
+
+    Device and pinned host buffers are allocated once per frame size and
+    reused; uploads, kernel and download are queued on one CUDA stream.
+    """
+
+    BLOCK = (16, 16)
+
+    def __init__(self, spatial_lut: np.ndarray, range_lut: np.ndarray):
+        """
+        Args:
+            spatial_lut, range_lut: Tables from bilateral_luts()
+        """
+        if not CUDA_AVAILABLE:
+            raise RuntimeError("CUDA not available - use joint_bilateral_depth instead")
+
+        self.radius = spatial_lut.shape[0] // 2
+        self._stream = cuda.stream()
+        self._spatial_d = cuda.to_device(spatial_lut, stream=self._stream)
+        self._range_d = cuda.to_device(range_lut, stream=self._stream)
+        self._shape = None
+
+    def _allocate(self, shape) -> None:
+        """(Re)allocate buffers for a new frame size."""
+        h, w = shape
+        self._depth_host = cuda.pinned_array((h, w), dtype=np.float32)
+        self._color_host = cuda.pinned_array((h, w, 3), dtype=np.uint8)
+        self._out_host = cuda.pinned_array((h, w), dtype=np.float32)
+        self._depth_d = cuda.device_array((h, w), dtype=np.float32, stream=self._stream)
+        self._color_d = cuda.device_array((h, w, 3), dtype=np.uint8, stream=self._stream)
+        self._out_d = cuda.device_array((h, w), dtype=np.float32, stream=self._stream)
+        self._grid = (
+            (w + self.BLOCK[0] - 1) // self.BLOCK[0],
+            (h + self.BLOCK[1] - 1) // self.BLOCK[1],
+        )
+        self._shape = shape
+
+    def __call__(self, depth: np.ndarray, color: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """Filter depth guided by color into out (same contract as joint_bilateral_depth)."""
+        if depth.shape != self._shape:
+            self._allocate(depth.shape)
+
+        # Stage through pinned memory so the copies run asynchronously
+        np.copyto(self._depth_host, depth)
+        np.copyto(self._color_host, color)
+        self._depth_d.copy_to_device(self._depth_host, stream=self._stream)
+        self._color_d.copy_to_device(self._color_host, stream=self._stream)
+
+        _joint_bilateral_cuda_kernel[self._grid, self.BLOCK, self._stream](
+            self._depth_d, self._color_d, self._spatial_d, self._range_d,
+            self.radius, self._out_d
+        )
+
+        self._out_d.copy_to_host(self._out_host, stream=self._stream)
+        self._stream.synchronize()
+        np.copyto(out, self._out_host)
+        return out
@@ -0,0 +1,202 @@
+"""
+Line Kernels - Compiled per-pixel loops for the line detector.
+Fuses adaptive threshold, Otsu threshold and ROI mask into one pass, and
+reduces slices to centroid sums without temporary arrays.
+"""
+
+from typing import Optional
+
+import cv2
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op decorator when numba is not installed."""
+        def decorator(func):
+            return func
+        return decorator
+
+
+@njit(cache=True)
+def _otsu_from_hist(hist: np.ndarray, total: int) -> int:
+    """Otsu threshold from a 256-bin histogram (same search as OpenCV)."""
+    scale = 1.0 / total
+    mu = 0.0
+    for i in range(256):
+        mu += i * float(hist[i])
+    mu *= scale
+
+    eps = 1.1920928955078125e-07  # FLT_EPSILON
+    mu1 = 0.0
+    q1 = 0.0
+    max_sigma = 0.0
+    max_val = 0
+    for i in range(256):
+        p_i = hist[i] * scale
+        mu1 *= q1
+        q1 += p_i
+        q2 = 1.0 - q1
+        if min(q1, q2) < eps or max(q1, q2) > 1.0 - eps:
+            continue
+        mu1 = (mu1 + i * p_i) / q1
+        mu2 = (mu - q1 * mu1) / q2
+        sigma = q1 * q2 * (mu1 - mu2) * (mu1 - mu2)
+        if sigma > max_sigma:
+            max_sigma = sigma
+            max_val = i
+    return max_val
+
+
+@njit(parallel=True, cache=True)
+def _fused_threshold_kernel(
+    gray: np.ndarray,
+    sat: np.ndarray,
+    roi_mask: np.ndarray,
+    block_size: int,
+    delta: int,
+    otsu_thresh: int,
+    out: np.ndarray
+) -> None:
+    """Adaptive mean-C AND Otsu (both inverted) AND ROI, rows split across threads."""
+    h, w = gray.shape
+    scale = 1.0 / (block_size * block_size)
+    for y in prange(h):
+        for x in range(w):
+            g = np.int32(gray[y, x])
+            if roi_mask[y, x] == 0 or g > otsu_thresh:
+                out[y, x] = 0
+                continue
+            # Window sum from the integral image of the edge-padded frame
+            s = (sat[y + block_size, x + block_size] - sat[y, x + block_size] -
+                 sat[y + block_size, x] + sat[y, x])
+            mean = np.int32(np.rint(s * scale))
+            out[y, x] = 255 if g - mean <= -delta else 0
+
+
+@njit(cache=True)
+def _slice_line_sums_kernel(
+    binary: np.ndarray,
+    top: int,
+    slice_height: int,
+    x_bounds: np.ndarray,
+    counts: np.ndarray,
+    x_sums: np.ndarray
+) -> None:
+    """Count and x-coordinate sum of nonzero pixels per horizontal slice."""
+    for i in range(counts.shape[0]):
+        count = 0
+        x_sum = 0
+        y_start = top + i * slice_height
+        x_lo = x_bounds[i, 0]
+        x_hi = x_bounds[i, 1]
+        for y in range(y_start, y_start + slice_height):
+            for x in range(x_lo, x_hi):
+                if binary[y, x] != 0:
+                    count += 1
+                    x_sum += x
+        counts[i] = count
+        x_sums[i] = x_sum
+
+
+def slice_line_sums(
+    binary: np.ndarray,
+    top: int,
+    num_slices: int,
+    slice_height: int,
+    x_indices: Optional[np.ndarray] = None,
+    x_bounds: Optional[np.ndarray] = None
+):
+    """
+    Line pixel statistics for stacked horizontal slices, in one pass.
+
+    Args:
+        binary: (H, W) uint8 image, line pixels nonzero (0/255)
+        top: First row of the first slice
+        num_slices: Number of slices
+        slice_height: Rows per slice
+        x_indices: Optional cached (W,) int64 np.arange(W) for the NumPy
+            fallback, so it is not rebuilt every call
+        x_bounds: Optional (num_slices, 2) int64 [x_lo, x_hi) column range
+            per slice; pixels outside it must be zero (only narrows the scan)
+
+    Returns:
+        (counts, x_sums): (num_slices,) int64 line pixel counts and sums of
+        their x coordinates (centroid x = x_sums // counts)
+    """
+    counts = np.empty(num_slices, dtype=np.int64)
+    x_sums = np.empty(num_slices, dtype=np.int64)
+    if NUMBA_AVAILABLE:
+        if x_bounds is None:
+            x_bounds = np.empty((num_slices, 2), dtype=np.int64)
+            x_bounds[:, 0] = 0
+            x_bounds[:, 1] = binary.shape[1]
+        _slice_line_sums_kernel(binary, top, slice_height, x_bounds, counts, x_sums)
+        return counts, x_sums
+
+    # NumPy fallback: (slices, rows, width) view reduced to column counts
+    width = binary.shape[1]
+    band = binary[top:top + num_slices * slice_height]
+    col_counts = band.reshape(num_slices, slice_height, width).sum(axis=1, dtype=np.int32) // 255
+    counts[:] = col_counts.sum(axis=1)
+    if x_indices is None:
+        x_indices = np.arange(width, dtype=np.int64)
+    x_sums[:] = col_counts @ x_indices
+    return counts, x_sums
+
+
+def otsu_threshold(gray: np.ndarray) -> int:
+    """
+    Otsu threshold of a grayscale image without producing the binary image.
+
+    Args:
+        gray: (H, W) uint8 image
+
+    Returns:
+        Threshold value (same as cv2.threshold with THRESH_OTSU)
+    """
+    hist = cv2.calcHist([gray], [0], None, [256], [0, 256]).ravel()
+    return int(_otsu_from_hist(hist, gray.size))
+
+
+def adaptive_otsu_binary(
+    gray: np.ndarray,
+    roi_mask: np.ndarray,
+    block_size: int,
+    C: float,
+    out: np.ndarray
+) -> np.ndarray:
+    """
+    Inverted adaptive (box mean) AND Otsu threshold inside the ROI, in one pass.
+
+    Same result as bitwise_and(adaptiveThreshold(gray, 255, MEAN_C,
+    BINARY_INV, block_size, C), threshold(gray, 0, 255, BINARY_INV + OTSU),
+    mask=roi_mask) with zeros outside the ROI.
+
+    Args:
+        gray: (H, W) uint8 image
+        roi_mask: (H, W) uint8 mask, nonzero inside the ROI
+        block_size: Odd adaptive threshold window size
+        C: Constant subtracted from the local mean
+        out: (H, W) uint8 output buffer
+
+    Returns:
+        out
+    """
+    otsu_thresh = otsu_threshold(gray)
+
+    # Integral image of the edge-replicated frame gives every window sum in
+    # four lookups, whatever the block size
+    r = block_size // 2
+    padded = cv2.copyMakeBorder(gray, r, r, r, r, cv2.BORDER_REPLICATE)
+    sat = cv2.integral(padded, sdepth=cv2.CV_32S)
+
+    _fused_threshold_kernel(
+        gray, sat, roi_mask, block_size, int(np.floor(C)), otsu_thresh, out
+    )
+    return out
@@ -7,21 +7,31 @@ Simplified version - no lane classification.
 import cv2
 import numpy as np
 import logging
-from typing import List, Optional, Tuple
+import importlib.util
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Tuple
 from dataclasses import dataclass
 
-try:
-    from ultralytics import YOLO
-    YOLO_AVAILABLE = True
-except ImportError:
-    YOLO_AVAILABLE = False
+# ultralytics pulls in torch (slow, 200+ MB), so only check that it is
+# installed here and import it when a detector is actually created
+YOLO_AVAILABLE = importlib.util.find_spec("ultralytics") is not None
+if not YOLO_AVAILABLE:
     logging.warning("ultralytics not installed. Object detection will be disabled.")
+if TYPE_CHECKING:
+    from ultralytics import YOLO
 
 from src.core import config
 
 logger = logging.getLogger(__name__)
 
 
+def _yolo_class():
+    """Import and return ultralytics.YOLO (deferred until first use)."""
+    from ultralytics import YOLO
+    return YOLO
+
+
 @dataclass
 class DetectedObject:
     """Represents a detected object with all relevant information."""
@@ -41,6 +51,12 @@ class ObjectDetectionResult:
     obstacles: List[DetectedObject]  # Objects within safe distance
     closest_obstacle: Optional[DetectedObject]
     emergency_stop: bool  # True if any obstacle is too close
+    
+    # Same detections as arrays (row i = objects[i]) for vectorized consumers
+    boxes: Optional[np.ndarray] = None      # (N, 4) int32 x1, y1, x2, y2
+    scores: Optional[np.ndarray] = None     # (N,) float32 confidence
+    class_ids: Optional[np.ndarray] = None  # (N,) int32
+    depths: Optional[np.ndarray] = None     # (N,) float32 meters, -1 if invalid
 
 
 class ObjectDetector:
@@ -56,12 +72,18 @@ class ObjectDetector:
         Args:
             model_path: Path to YOLO model weights
         """
-        self.model: Optional[YOLO] = None
+        self.model: Optional["YOLO"] = None
         self.model_path = model_path
+        
+        # Single worker for detect_async (created on first use)
+        self._executor: Optional[ThreadPoolExecutor] = None
 
         if YOLO_AVAILABLE:
             try:
-                self.model = YOLO(model_path)
+                if config.YOLO_TENSORRT_ENABLED:
+                    model_path = self._get_tensorrt_engine(model_path)
+                self.model = _yolo_class()(model_path)
+                self.model_path = model_path
                 logger.info(f"YOLO model loaded: {model_path}")
             except Exception as e:
                 logger.error(f"Failed to load YOLO model: {e}")
@@ -69,10 +91,84 @@ class ObjectDetector:
         else:
             logger.warning("YOLO not available - object detection disabled")
 
+    def _get_tensorrt_engine(self, model_path: str) -> str:
+        """
+        Get path to a TensorRT engine for the given weights, building it if needed.
+        
+        The engine is exported once next to the .pt file and reused afterwards.
+        Falls back to the original weights if the export fails (no TensorRT/CUDA).
+
+        Args:
+            model_path: Path to YOLO weights (.pt) or an existing .engine
+
+        Returns:
+            Path to the model to load
+        """
+        weights = Path(model_path)
+        if weights.suffix == '.engine':
+            return model_path
+        
+        int8 = config.YOLO_TENSORRT_INT8
+        if int8 and config.YOLO_TENSORRT_CALIB_DATA is None:
+            logger.warning("TensorRT INT8 requested without calibration_data - using FP16")
+            int8 = False
+        
+        if int8:
+            precision = 'int8'
+        else:
+            precision = 'fp16' if config.YOLO_TENSORRT_HALF else 'fp32'
+        
+        # One engine file per precision so switching config never loads a stale engine
+        engine_path = weights.with_name(f"{weights.stem}_{precision}.engine")
+        if engine_path.exists():
+            return str(engine_path)
+        
+        logger.info(f"Building TensorRT {precision.upper()} engine from {model_path} (one-time)...")
+        try:
+            exported = _yolo_class()(model_path).export(
+                format='engine',
+                half=config.YOLO_TENSORRT_HALF or int8,
+                int8=int8,
+                data=config.YOLO_TENSORRT_CALIB_DATA if int8 else None,
+                workspace=config.YOLO_TENSORRT_WORKSPACE,
+                verbose=False
+            )
+            Path(exported).replace(engine_path)
+            return str(engine_path)
+        except Exception as e:
+            logger.error(f"TensorRT export failed, using {model_path}: {e}")
+            return model_path
+
+    def _get_class_filter(self) -> Optional[List[int]]:
+        """Class IDs passed to YOLO so unused classes are dropped before NMS."""
+        if config.DETECT_CLASSES is None:
+            return None
+        return list(config.DETECT_CLASSES.keys())
+
+    def get_class_ids(self, class_names: List[str]) -> Optional[List[int]]:
+        """
+        Look up class IDs for class names (e.g. ["person"] -> [0]).
+
+        Args:
+            class_names: Class names to look up (case-insensitive)
+
+        Returns:
+            List of matching class IDs, or None if the model is not loaded
+            or no name matches (None means no filtering)
+        """
+        if self.model is None:
+            return None
+        
+        names = config.DETECT_CLASSES if config.DETECT_CLASSES is not None else self.model.names
+        wanted = {name.lower() for name in class_names}
+        class_ids = [class_id for class_id, name in names.items() if name.lower() in wanted]
+        return class_ids or None
+
     def detect(
         self,
         color_frame: np.ndarray,
-        depth_frame: Optional[np.ndarray] = None
+        depth_frame: Optional[np.ndarray] = None,
+        classes: Optional[List[int]] = None
     ) -> ObjectDetectionResult:
         """
         Detect objects in the frame.
@@ -80,6 +176,7 @@ class ObjectDetector:
         Args:
             color_frame: BGR image from camera
             depth_frame: Depth image in meters
+            classes: Only keep these class IDs (default: config.DETECT_CLASSES)
 
         Returns:
             ObjectDetectionResult containing all detected objects
@@ -95,6 +192,7 @@ class ObjectDetector:
                 color_frame,
                 conf=config.YOLO_CONFIDENCE_THRESHOLD,
                 iou=config.YOLO_NMS_THRESHOLD,
+                classes=classes if classes is not None else self._get_class_filter(),
                 verbose=False
             )
 
@@ -104,10 +202,15 @@ class ObjectDetector:
                 if boxes is None:
                     continue
 
-                for box in boxes:
-                    # Get class ID
-                    class_id = int(box.cls[0])
-                    
+                # Pull all boxes off the device in one transfer each instead
+                # of indexing small tensors per box
+                xyxy = boxes.xyxy.cpu().numpy().astype(np.int32)
+                confs = boxes.conf.cpu().numpy()
+                class_ids = boxes.cls.cpu().numpy().astype(np.int32)
+
+                for (x1, y1, x2, y2), confidence, class_id in zip(
+                    xyxy.tolist(), confs.tolist(), class_ids.tolist()
+                ):
                     # If DETECT_CLASSES is None, detect all; otherwise filter
                     if config.DETECT_CLASSES is not None and class_id not in config.DETECT_CLASSES:
                         continue
@@ -118,10 +221,6 @@ class ObjectDetector:
                     else:
                         class_name = self.model.names[class_id]
 
-                    # Extract detection info
-                    confidence = float(box.conf[0])
-                    x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
-
                     # Calculate center
                     cx = (x1 + x2) // 2
                     cy = (y1 + y2) // 2
@@ -152,6 +251,60 @@ class ObjectDetector:
 
         return self._create_result(detected_objects)
 
+    def detect_async(
+        self,
+        color_frame: np.ndarray,
+        depth_frame: Optional[np.ndarray] = None,
+        classes: Optional[List[int]] = None
+    ) -> Future:
+        """
+        Run detect() on a background worker thread.
+
+        Inference releases the GIL, so the caller can keep capturing and
+        drawing while the network runs. The frames must not be modified
+        until the returned future completes.
+
+        Returns:
+            Future resolving to an ObjectDetectionResult
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="detector")
+        return self._executor.submit(self.detect, color_frame, depth_frame, classes)
+
+    def close(self) -> None:
+        """Stop the async detection worker."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def measure_depths(
+        self,
+        depth_frame: Optional[np.ndarray],
+        boxes: np.ndarray
+    ) -> np.ndarray:
+        """
+        Measure depth for selected boxes only (same sampling as detect()).
+
+        Lets callers run detection without depth and only sample the few
+        boxes that survive their own filters.
+
+        Args:
+            depth_frame: Depth frame in meters
+            boxes: (N, 4) boxes as x1, y1, x2, y2
+
+        Returns:
+            (N,) float32 depths in meters, -1 where invalid
+        """
+        depths = np.full(len(boxes), -1.0, dtype=np.float32)
+        if depth_frame is None:
+            return depths
+        
+        for i, (x1, y1, x2, y2) in enumerate(boxes.tolist()):
+            depths[i] = self._get_depth_at_point(
+                depth_frame, (x1 + x2) // 2, (y1 + y2) // 2, bbox=(x1, y1, x2, y2)
+            )
+        return depths
+
     def _get_depth_at_point(
         self, 
         depth_frame: np.ndarray, 
@@ -266,11 +419,26 @@ class ObjectDetector:
             for obj in obstacles
         )
 
+        n = len(objects)
+        boxes = np.empty((n, 4), dtype=np.int32)
+        scores = np.empty(n, dtype=np.float32)
+        class_ids = np.empty(n, dtype=np.int32)
+        depths = np.empty(n, dtype=np.float32)
+        for i, obj in enumerate(objects):
+            boxes[i] = obj.bbox
+            scores[i] = obj.confidence
+            class_ids[i] = obj.class_id
+            depths[i] = obj.depth
+
         return ObjectDetectionResult(
             objects=objects,
             obstacles=obstacles,
             closest_obstacle=closest_obstacle,
-            emergency_stop=emergency_stop
+            emergency_stop=emergency_stop,
+            boxes=boxes,
+            scores=scores,
+            class_ids=class_ids,
+            depths=depths
         )
 
     def _create_empty_result(self) -> ObjectDetectionResult:
@@ -9,17 +9,32 @@ Calculates:
 import cv2
 import numpy as np
 import logging
-from typing import Optional, Tuple, List
-from dataclasses import dataclass
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+from dataclasses import dataclass, replace
 
 from src.core import config
+from .line_kernels import adaptive_otsu_binary, slice_line_sums, NUMBA_AVAILABLE
 
 logger = logging.getLogger(__name__)
 
+# Adaptive threshold neighborhood (must be odd) and constant subtracted from the mean
+ADAPTIVE_BLOCK_SIZE = 51
+ADAPTIVE_C = 10
+
 
 @dataclass
 class LineDetectionResult:
-    """Result of single line detection."""
+    """Result of single line detection (one per frame, so no per-instance __dict__)."""
+    __slots__ = (
+        'line_detected', 'position_error', 'position_error_pixels',
+        'heading_error', 'heading_error_degrees', 'line_center_x',
+        'line_center_y', 'confidence', 'centerline_points',
+        'search_direction', 'frames_lost'
+    )
+    
     line_detected: bool
     
     # Position error: positive = line is to the right of center
@@ -37,12 +52,12 @@ class LineDetectionResult:
     # Confidence
     confidence: float
     
-    # Centerline points for visualization
-    centerline_points: Optional[List[Tuple[int, int]]] = None
+    # Centerline points for visualization: (N, 2) int32 array of x, y
+    centerline_points: Optional[np.ndarray]
     
     # Line search/recovery info
-    search_direction: int = 0  # -1=left, 0=none, 1=right
-    frames_lost: int = 0  # Số frame liên tiếp mất line
+    search_direction: int  # -1=left, 0=none, 1=right
+    frames_lost: int  # Số frame liên tiếp mất line
 
 
 class SimpleLineDetector:
@@ -52,8 +67,17 @@ class SimpleLineDetector:
     Includes line recovery mode when line is lost.
     """
 
-    def __init__(self):
-        """Initialize detector."""
+    def __init__(self, proc_width: Optional[int] = None):
+        """
+        Initialize detector.
+
+        Args:
+            proc_width: Downscale wider frames to this width before detection
+                (default from config, 0 = full resolution). Results are
+                mapped back to input pixel coordinates.
+        """
+        self._proc_width = config.LINE_PROC_WIDTH if proc_width is None else proc_width
+        
         # Ensure kernel size is valid (must be odd and >= 1)
         kernel_size = max(1, config.MORPH_KERNEL_SIZE)
         if kernel_size % 2 == 0:
@@ -67,10 +91,41 @@ class SimpleLineDetector:
         self._roi_mask: Optional[np.ndarray] = None
         self._frame_size: Optional[Tuple[int, int]] = None
         
+        # ROI/slice geometry, rebuilt with the ROI mask when the frame size changes
+        self._vertices: Optional[np.ndarray] = None
+        self._roi_top = 0
+        self._roi_bottom = 0
+        self._slice_height = 0
+        self._roi_area = 1
+        self._x_indices: Optional[np.ndarray] = None
+        # Per-slice ROI column range and the morphology reach it was built for
+        self._slice_x_bounds: Optional[np.ndarray] = None
+        self._slice_x_bounds_margin = -1
+        self._image_center_x = 0.0
+        # ROI outline for visualize() at sizes other than the detection size
+        self._viz_vertices: Optional[np.ndarray] = None
+        self._viz_vertices_size: Optional[Tuple[int, int]] = None
+        # Reusable visualization buffer (allocated on first frame)
+        self._vis_buf: Optional[np.ndarray] = None
+        
+        # Per-frame image buffers, reallocated with the ROI mask
+        self._buf_resized: Optional[np.ndarray] = None
+        self._buf_gray: Optional[np.ndarray] = None
+        self._buf_blur: Optional[np.ndarray] = None
+        self._buf_close: Optional[np.ndarray] = None
+        self._buf_open: Optional[np.ndarray] = None
+        self._buf_adaptive: Optional[np.ndarray] = None
+        self._buf_otsu: Optional[np.ndarray] = None
+        self._buf_binary: Optional[np.ndarray] = None
+        
         # Smoothing - adaptive based on confidence
         self._prev_result: Optional[LineDetectionResult] = None
         self._base_smoothing_factor = 0.4
         
+        # detect_batch() workers, each with its own detector for scratch buffers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._batch_detectors: List["SimpleLineDetector"] = []
+        
         # Number of horizontal slices for centerline detection
         self._num_slices = 10
         
@@ -86,10 +141,89 @@ class SimpleLineDetector:
 
     def detect(self, frame: np.ndarray) -> LineDetectionResult:
         """Detect single line in frame with recovery mode."""
+        return self._finish_detection(*self._detect_raw(frame))
+
+    def detect_batch(self, frames: Sequence[np.ndarray]) -> List[LineDetectionResult]:
+        """
+        Detect the line in several queued frames, preprocessing them in parallel.
+
+        Thresholding, slicing and line fitting of each frame are independent
+        and OpenCV releases the GIL, so they run on worker threads. Recovery
+        and smoothing state is then advanced frame by frame, in order, giving
+        the same results as calling detect() on each frame.
+
+        Args:
+            frames: Frames in capture order
+
+        Returns:
+            One result per frame
+        """
+        frames = list(frames)
+        if len(frames) < 2:
+            return [self.detect(frame) for frame in frames]
+        
+        n_workers = min(len(frames), os.cpu_count() or 1)
+        if self._executor is None or len(self._batch_detectors) < n_workers:
+            self.close()
+            self._executor = ThreadPoolExecutor(max_workers=n_workers, thread_name_prefix="line")
+            self._batch_detectors = [
+                SimpleLineDetector(proc_width=self._proc_width) for _ in range(n_workers)
+            ]
+        
+        # Contiguous chunks, one worker detector per chunk (buffers are not shared)
+        chunk = -(-len(frames) // n_workers)
+        futures = [
+            self._executor.submit(
+                lambda det, part: [det._detect_raw(f) for f in part],
+                detector, frames[start:start + chunk]
+            )
+            for detector, start in zip(self._batch_detectors, range(0, len(frames), chunk))
+        ]
+        
+        results = []
+        for future in futures:
+            for raw in future.result():
+                results.append(self._finish_detection(*raw))
+        return results
+
+    def close(self) -> None:
+        """Stop the detect_batch() workers."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._batch_detectors = []
+
+    def _detect_raw(
+        self,
+        frame: np.ndarray
+    ) -> Tuple[Optional[LineDetectionResult], float, float]:
+        """
+        Stateless part of detect(): preprocess, slice and fit one frame.
+
+        Returns:
+            (unsmoothed result at processing resolution or None if no line
+            was found, scale_x, scale_y back to input pixels)
+        """
         if frame is None or frame.size == 0:
-            return self._handle_line_lost()
+            return None, 1.0, 1.0
 
         height, width = frame.shape[:2]
+        
+        # Step 0: Work at the processing resolution (area averaging keeps
+        # thin lines visible)
+        scale_x = scale_y = 1.0
+        if 0 < self._proc_width < width:
+            proc_height = max(1, round(height * self._proc_width / width))
+            scale_x = width / self._proc_width
+            scale_y = height / proc_height
+            resized_shape = (proc_height, self._proc_width) + frame.shape[2:]
+            if self._buf_resized is None or self._buf_resized.shape != resized_shape:
+                self._buf_resized = np.empty(resized_shape, dtype=frame.dtype)
+            frame = cv2.resize(
+                frame, (self._proc_width, proc_height), dst=self._buf_resized,
+                interpolation=cv2.INTER_AREA
+            )
+            height, width = proc_height, self._proc_width
 
         # Step 1: Preprocess
         binary = self._preprocess(frame)
@@ -98,15 +232,25 @@ class SimpleLineDetector:
         centerline_points = self._find_centerline(binary, height, width)
 
         if len(centerline_points) < 3:
+            return None, scale_x, scale_y
+
+        # Step 3: Fit line and calculate errors
+        return self._calculate_errors(centerline_points, width, height), scale_x, scale_y
+
+    def _finish_detection(
+        self,
+        result: Optional[LineDetectionResult],
+        scale_x: float,
+        scale_y: float
+    ) -> LineDetectionResult:
+        """Advance recovery and smoothing state with a raw detection (in frame order)."""
+        if result is None:
             # Line not found - enter recovery mode
             return self._handle_line_lost()
 
         # Line found - reset recovery state
         self._frames_lost = 0
         self._search_direction = 0
-
-        # Step 3: Fit line and calculate errors
-        result = self._calculate_errors(centerline_points, width, height)
         
         # Save last known position for recovery
         self._last_known_position = result.position_error
@@ -116,9 +260,31 @@ class SimpleLineDetector:
         if self._prev_result is not None and self._prev_result.line_detected:
             result = self._smooth_result(result, smoothing_factor)
 
+        # Smoothing state stays at the processing resolution
         self._prev_result = result
+        if scale_x != 1.0 or scale_y != 1.0:
+            result = self._rescale_result(result, scale_x, scale_y)
         return result
 
+    def _rescale_result(
+        self,
+        result: LineDetectionResult,
+        scale_x: float,
+        scale_y: float
+    ) -> LineDetectionResult:
+        """Map pixel fields of a downscaled detection back to input coordinates."""
+        points = result.centerline_points
+        if points is not None:
+            points = (points * np.array([scale_x, scale_y])).astype(np.int32)
+        
+        return replace(
+            result,
+            position_error_pixels=result.position_error_pixels * scale_x,
+            line_center_x=result.line_center_x * scale_x,
+            line_center_y=result.line_center_y * scale_y,
+            centerline_points=points
+        )
+
     def _handle_line_lost(self) -> LineDetectionResult:
         """
         Handle case when line is lost.
@@ -194,6 +360,51 @@ class SimpleLineDetector:
         
         return max(0.1, min(0.6, alpha))
 
+    @staticmethod
+    def _roi_vertices(height: int, width: int) -> np.ndarray:
+        """ROI trapezoid corners for a frame size."""
+        return np.array([[
+            (int(width * config.ROI_BOTTOM_LEFT_X), int(height * config.ROI_BOTTOM_Y)),
+            (int(width * config.ROI_BOTTOM_RIGHT_X), int(height * config.ROI_BOTTOM_Y)),
+            (int(width * config.ROI_TOP_RIGHT_X), int(height * config.ROI_TOP_Y)),
+            (int(width * config.ROI_TOP_LEFT_X), int(height * config.ROI_TOP_Y)),
+        ]], dtype=np.int32)
+
+    def _update_geometry(self, height: int, width: int) -> None:
+        """Build the ROI mask, slice geometry and scratch buffers for a frame size."""
+        self._frame_size = (height, width)
+        self._roi_mask = np.zeros((height, width), dtype=np.uint8)
+        
+        self._vertices = self._roi_vertices(height, width)
+        cv2.fillPoly(self._roi_mask, self._vertices, 255)
+        self._roi_area = max(1, cv2.countNonZero(self._roi_mask))
+        
+        self._roi_top = int(height * config.ROI_TOP_Y)
+        self._roi_bottom = int(height * config.ROI_BOTTOM_Y)
+        self._slice_height = (self._roi_bottom - self._roi_top) // self._num_slices
+        if self._slice_height < 1:
+            # Every slice would be empty and the line always reported lost
+            logger.warning(
+                "ROI of %dx%d frame too short for %d slices - increase "
+                "lane_detection.proc_width", width, height, self._num_slices
+            )
+        
+        # Robot center in this frame: camera offset is in camera pixels,
+        # scale it when the frame is subsampled
+        self._image_center_x = width / 2 + config.CAMERA_OFFSET_X * width / config.CAMERA_WIDTH
+        self._x_indices = np.arange(width, dtype=np.int64)
+        self._slice_x_bounds = None
+        
+        self._buf_gray = np.empty((height, width), dtype=np.uint8)
+        self._buf_blur = np.empty((height, width), dtype=np.uint8)
+        self._buf_close = np.empty((height, width), dtype=np.uint8)
+        self._buf_open = np.empty((height, width), dtype=np.uint8)
+        self._buf_adaptive = np.empty((height, width), dtype=np.uint8)
+        self._buf_otsu = np.empty((height, width), dtype=np.uint8)
+        # Masked writes leave pixels outside the ROI untouched, so they
+        # must start (and stay) zero
+        self._buf_binary = np.zeros((height, width), dtype=np.uint8)
+
     def _preprocess(self, frame: np.ndarray) -> np.ndarray:
         """
         Preprocess image with adaptive thresholding.
@@ -203,23 +414,67 @@ class SimpleLineDetector:
         
         # Create ROI mask
         if self._roi_mask is None or self._frame_size != (height, width):
-            self._frame_size = (height, width)
-            self._roi_mask = np.zeros((height, width), dtype=np.uint8)
-            
-            vertices = np.array([[
-                (int(width * config.ROI_BOTTOM_LEFT_X), int(height * config.ROI_BOTTOM_Y)),
-                (int(width * config.ROI_BOTTOM_RIGHT_X), int(height * config.ROI_BOTTOM_Y)),
-                (int(width * config.ROI_TOP_RIGHT_X), int(height * config.ROI_TOP_Y)),
-                (int(width * config.ROI_TOP_LEFT_X), int(height * config.ROI_TOP_Y)),
-            ]], dtype=np.int32)
-            cv2.fillPoly(self._roi_mask, vertices, 255)
+            self._update_geometry(height, width)
 
         # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._buf_gray)
         
-        # Apply Gaussian blur to reduce noise
-        gray = cv2.GaussianBlur(gray, (5, 5), 0)
+        # Blur to reduce noise (the adaptive threshold smooths again, so a
+        # small box is enough when configured)
+        if config.LINE_BOX_BLUR:
+            gray = cv2.blur(gray, (3, 3), dst=self._buf_blur)
+        else:
+            gray = cv2.GaussianBlur(gray, (5, 5), 0, dst=self._buf_blur)
+
+        if self._is_low_light(gray):
+            # Adaptive + Otsu would come out too sparse anyway
+            binary = self._threshold_fixed(gray)
+        else:
+            if config.LINE_FUSED_THRESHOLD and NUMBA_AVAILABLE:
+                # Adaptive (box mean) AND Otsu AND ROI in one compiled pass
+                binary = adaptive_otsu_binary(
+                    gray, self._roi_mask, ADAPTIVE_BLOCK_SIZE, ADAPTIVE_C, self._buf_binary
+                )
+            else:
+                binary = self._threshold_opencv(gray)
+            
+            # If combination is too sparse, fall back to config threshold
+            roi_pixels = cv2.countNonZero(binary)
+            if roi_pixels < 100:  # Not enough pixels detected
+                binary = self._threshold_fixed(gray)
 
+        # Morphological operations
+        if config.MORPH_CLOSE_ITERATIONS > 0:
+            binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, self.morph_kernel,
+                                     dst=self._buf_close,
+                                     iterations=config.MORPH_CLOSE_ITERATIONS)
+        if config.MORPH_OPEN_ITERATIONS > 0:
+            binary = cv2.morphologyEx(binary, cv2.MORPH_OPEN, self.morph_kernel,
+                                     dst=self._buf_open,
+                                     iterations=config.MORPH_OPEN_ITERATIONS)
+
+        return binary
+
+    def _is_low_light(self, gray: np.ndarray) -> bool:
+        """Whether the ROI is too dark or flat for adaptive thresholding."""
+        min_mean = config.LINE_LOW_LIGHT_MEAN
+        min_std = config.LINE_LOW_CONTRAST_STD
+        if min_mean <= 0 and min_std <= 0:
+            return False
+        
+        mean, std = cv2.meanStdDev(gray, mask=self._roi_mask)
+        return mean[0, 0] < min_mean or std[0, 0] < min_std
+
+    def _threshold_fixed(self, gray: np.ndarray) -> np.ndarray:
+        """Fixed BLACK_THRESHOLD binary inside the ROI."""
+        binary = cv2.threshold(
+            gray, config.BLACK_THRESHOLD, 255, cv2.THRESH_BINARY_INV, dst=self._buf_binary
+        )[1]
+        # Apply ROI
+        return cv2.bitwise_and(binary, self._roi_mask, dst=binary)
+
+    def _threshold_opencv(self, gray: np.ndarray) -> np.ndarray:
+        """Gaussian adaptive threshold AND Otsu threshold, inside the ROI."""
         # Use adaptive thresholding for varying lighting conditions
         # This automatically adjusts threshold based on local neighborhood
         binary_adaptive = cv2.adaptiveThreshold(
@@ -227,114 +482,133 @@ class SimpleLineDetector:
             255,
             cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
             cv2.THRESH_BINARY_INV,
-            blockSize=51,  # Size of neighborhood (must be odd)
-            C=10  # Constant subtracted from mean
+            blockSize=ADAPTIVE_BLOCK_SIZE,
+            C=ADAPTIVE_C,
+            dst=self._buf_adaptive
         )
         
+        min_fill = config.LINE_ADAPTIVE_ONLY_MIN_FILL
+        max_fill = config.LINE_ADAPTIVE_ONLY_MAX_FILL
+        if min_fill < max_fill:
+            # Adaptive result inside the ROI (pixels outside stay zero)
+            binary = cv2.bitwise_and(
+                binary_adaptive, binary_adaptive, dst=self._buf_binary, mask=self._roi_mask
+            )
+            fill = cv2.countNonZero(binary) / self._roi_area
+            if min_fill < fill < max_fill:
+                # Plausible amount of line - Otsu would not change much
+                return binary
+            _, binary_otsu = cv2.threshold(
+                gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU, dst=self._buf_otsu
+            )
+            return cv2.bitwise_and(binary, binary_otsu, dst=binary)
+        
         # Also use Otsu's method as fallback/combination
         _, binary_otsu = cv2.threshold(
             gray, 0, 255, 
-            cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU
+            cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU,
+            dst=self._buf_otsu
         )
         
         # Combine both methods - use intersection for robustness
-        # This helps filter noise while keeping strong line signals
-        binary = cv2.bitwise_and(binary_adaptive, binary_otsu)
-        
-        # If combination is too sparse, fall back to config threshold
-        roi_pixels = cv2.countNonZero(cv2.bitwise_and(binary, self._roi_mask))
-        if roi_pixels < 100:  # Not enough pixels detected
-            _, binary = cv2.threshold(gray, config.BLACK_THRESHOLD, 255, cv2.THRESH_BINARY_INV)
-
-        # Apply ROI
-        binary = cv2.bitwise_and(binary, self._roi_mask)
-
-        # Morphological operations
-        if config.MORPH_CLOSE_ITERATIONS > 0:
-            binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, self.morph_kernel,
-                                     iterations=config.MORPH_CLOSE_ITERATIONS)
-        if config.MORPH_OPEN_ITERATIONS > 0:
-            binary = cv2.morphologyEx(binary, cv2.MORPH_OPEN, self.morph_kernel,
-                                     iterations=config.MORPH_OPEN_ITERATIONS)
-
-        return binary
+        # This helps filter noise while keeping strong line signals.
+        # The ROI is applied in the same pass (pixels outside stay zero)
+        return cv2.bitwise_and(
+            binary_adaptive, binary_otsu, dst=self._buf_binary, mask=self._roi_mask
+        )
 
     def _find_centerline(
         self, 
         binary: np.ndarray, 
         height: int, 
         width: int
-    ) -> List[Tuple[int, int]]:
+    ) -> np.ndarray:
         """
         Find centerline by scanning horizontal slices.
         For each slice, find the centroid of white pixels (the line).
+
+        Returns:
+            (N, 2) int32 array of (x, y) points, one per slice with a line
         """
-        centerline_points = []
+        # ROI boundaries and slices (cached per frame size by _preprocess)
+        roi_top = self._roi_top
+        num_slices = self._num_slices
+        slice_height = self._slice_height
+        if slice_height <= 0:
+            return np.empty((0, 2), dtype=np.int32)
+        
+        # White pixel count and x sum of every slice in one pass
+        counts, x_sums = slice_line_sums(
+            binary, roi_top, num_slices, slice_height, self._x_indices,
+            self._get_slice_x_bounds()
+        )
         
-        # Define ROI boundaries
-        roi_top = int(height * config.ROI_TOP_Y)
-        roi_bottom = int(height * config.ROI_BOTTOM_Y)
+        found = np.flatnonzero(counts > 10)  # Need enough pixels
+        centerline_points = np.empty((found.size, 2), dtype=np.int32)
+        # Centroid (average x position), truncated like int(np.mean(x))
+        centerline_points[:, 0] = x_sums[found] // counts[found]
+        # Slice center row
+        centerline_points[:, 1] = roi_top + found * slice_height + slice_height // 2
         
-        # Create slices
-        slice_height = (roi_bottom - roi_top) // self._num_slices
+        return centerline_points
+
+    def _get_slice_x_bounds(self) -> np.ndarray:
+        """
+        Column range [x_lo, x_hi) per slice that can hold line pixels.
+
+        The binary is zero outside the ROI except where closing grew blobs
+        past its edge, so the ROI extent is widened by the closing reach.
+        """
+        margin = (self.morph_kernel.shape[1] // 2) * max(0, config.MORPH_CLOSE_ITERATIONS)
+        if self._slice_x_bounds is not None and self._slice_x_bounds_margin == margin:
+            return self._slice_x_bounds
         
+        height, width = self._roi_mask.shape
+        bounds = np.zeros((self._num_slices, 2), dtype=np.int64)
         for i in range(self._num_slices):
-            y_start = roi_top + i * slice_height
-            y_end = y_start + slice_height
-            y_center = (y_start + y_end) // 2
-            
-            # Get slice
-            slice_img = binary[y_start:y_end, :]
-            
-            # Find white pixels (line)
-            white_pixels = np.where(slice_img > 0)
-            
-            if len(white_pixels[1]) > 10:  # Need enough pixels
-                # Calculate centroid (average x position)
-                x_center = int(np.mean(white_pixels[1]))
-                centerline_points.append((x_center, y_center))
+            y_start = self._roi_top + i * self._slice_height
+            rows = self._roi_mask[max(0, y_start - margin):y_start + self._slice_height + margin]
+            cols = np.flatnonzero(rows.any(axis=0))
+            if cols.size:
+                bounds[i] = (max(0, cols[0] - margin), min(width, cols[-1] + 1 + margin))
         
-        return centerline_points
+        self._slice_x_bounds = bounds
+        self._slice_x_bounds_margin = margin
+        return bounds
 
     def _calculate_errors(
         self, 
-        points: List[Tuple[int, int]], 
+        points: np.ndarray, 
         width: int, 
         height: int
     ) -> LineDetectionResult:
-        """Calculate position and heading errors from centerline points."""
-        points_array = np.array(points)
+        """Calculate position and heading errors from (N, 2) centerline points."""
+        x_vals = points[:, 0].astype(np.float64)
+        y_vals = points[:, 1].astype(np.float64)
         
-        # Use the bottom point (closest to robot) for position error
-        # Sort by y (descending) to get bottom first
-        sorted_points = sorted(points, key=lambda p: p[1], reverse=True)
-        bottom_point = sorted_points[0]
+        # Use the bottom point (closest to robot) for position error; slices
+        # are emitted top to bottom, so it is the last row
+        bottom_x, bottom_y = points[-1].tolist()
         
         # Position error at bottom (look-ahead point)
-        # Adjust for camera offset from robot center
-        image_center_x = width / 2 + config.CAMERA_OFFSET_X
-        position_error_pixels = bottom_point[0] - image_center_x
+        # Adjust for camera offset from robot center (cached per frame size)
+        image_center_x = self._image_center_x
+        position_error_pixels = bottom_x - image_center_x
         position_error = position_error_pixels / (width / 2)
         position_error = np.clip(position_error, -1, 1)
         
         # Heading error - fit a line through points
+        heading_error = 0.0
         if len(points) >= 2:
-            # Fit line: x = m*y + b
-            y_vals = points_array[:, 1]
-            x_vals = points_array[:, 0]
-            
-            try:
-                # Linear fit
-                coeffs = np.polyfit(y_vals, x_vals, 1)
-                slope = coeffs[0]  # dx/dy
+            # Least-squares fit x = m*y + b in closed form (no polyfit/lstsq)
+            dy = y_vals - y_vals.mean()
+            dy_var = float(dy @ dy)
+            if dy_var > 0:
+                slope = float(dy @ (x_vals - x_vals.mean())) / dy_var  # dx/dy
                 
                 # Heading error = arctan(slope)
                 # slope > 0 means line tilts right as we go up
                 heading_error = np.arctan(slope)
-            except:
-                heading_error = 0.0
-        else:
-            heading_error = 0.0
         
         # Confidence based on number of detected points
         confidence = len(points) / self._num_slices
@@ -345,10 +619,12 @@ class SimpleLineDetector:
             position_error_pixels=float(position_error_pixels),
             heading_error=float(heading_error),
             heading_error_degrees=float(np.degrees(heading_error)),
-            line_center_x=float(bottom_point[0]),
-            line_center_y=float(bottom_point[1]),
+            line_center_x=float(bottom_x),
+            line_center_y=float(bottom_y),
             confidence=float(confidence),
-            centerline_points=points
+            centerline_points=points,
+            search_direction=0,
+            frames_lost=0
         )
 
     def _smooth_result(self, result: LineDetectionResult, alpha: float = None) -> LineDetectionResult:
@@ -359,20 +635,16 @@ class SimpleLineDetector:
         if alpha is None:
             alpha = self._base_smoothing_factor
         
-        smoothed_pos = alpha * result.position_error + (1 - alpha) * self._prev_result.position_error
-        smoothed_pos_px = alpha * result.position_error_pixels + (1 - alpha) * self._prev_result.position_error_pixels
-        smoothed_heading = alpha * result.heading_error + (1 - alpha) * self._prev_result.heading_error
+        prev = self._prev_result
+        beta = 1 - alpha
+        smoothed_heading = alpha * result.heading_error + beta * prev.heading_error
         
-        return LineDetectionResult(
-            line_detected=True,
-            position_error=smoothed_pos,
-            position_error_pixels=smoothed_pos_px,
+        return replace(
+            result,
+            position_error=alpha * result.position_error + beta * prev.position_error,
+            position_error_pixels=alpha * result.position_error_pixels + beta * prev.position_error_pixels,
             heading_error=smoothed_heading,
-            heading_error_degrees=np.degrees(smoothed_heading),
-            line_center_x=result.line_center_x,
-            line_center_y=result.line_center_y,
-            confidence=result.confidence,
-            centerline_points=result.centerline_points,
+            heading_error_degrees=math.degrees(smoothed_heading),
             search_direction=0,
             frames_lost=0
         )
@@ -388,21 +660,35 @@ class SimpleLineDetector:
             line_center_x=0.0,
             line_center_y=0.0,
             confidence=0.0,
-            centerline_points=None
+            centerline_points=None,
+            search_direction=0,
+            frames_lost=0
         )
 
     def visualize(self, frame: np.ndarray, result: LineDetectionResult) -> np.ndarray:
-        """Draw visualization."""
-        vis = frame.copy()
+        """
+        Draw visualization.
+
+        The returned image is a buffer reused by the next call; copy it if
+        it must outlive the next frame.
+        """
+        # Reuse the drawing buffer instead of allocating a new copy each frame
+        if (self._vis_buf is None or self._vis_buf.shape != frame.shape
+                or self._vis_buf.dtype != frame.dtype):
+            self._vis_buf = np.empty_like(frame)
+        np.copyto(self._vis_buf, frame)
+        vis = self._vis_buf
         height, width = frame.shape[:2]
         
-        # Draw ROI
-        vertices = np.array([[
-            (int(width * config.ROI_BOTTOM_LEFT_X), int(height * config.ROI_BOTTOM_Y)),
-            (int(width * config.ROI_BOTTOM_RIGHT_X), int(height * config.ROI_BOTTOM_Y)),
-            (int(width * config.ROI_TOP_RIGHT_X), int(height * config.ROI_TOP_Y)),
-            (int(width * config.ROI_TOP_LEFT_X), int(height * config.ROI_TOP_Y)),
-        ]], dtype=np.int32)
+        # Draw ROI (visualized frames are often larger than the detection
+        # input, so do not rebuild the detection geometry for them)
+        if self._frame_size == (height, width):
+            vertices = self._vertices
+        else:
+            if self._viz_vertices_size != (height, width):
+                self._viz_vertices = self._roi_vertices(height, width)
+                self._viz_vertices_size = (height, width)
+            vertices = self._viz_vertices
         cv2.polylines(vis, vertices, True, (0, 255, 255), 2)
 
         # Draw center reference lines
@@ -432,14 +718,13 @@ class SimpleLineDetector:
             return vis
 
         # Draw centerline points
-        if result.centerline_points:
-            for i, (x, y) in enumerate(result.centerline_points):
-                cv2.circle(vis, (x, y), 5, (0, 255, 0), -1)
+        if result.centerline_points is not None and len(result.centerline_points):
+            points = [tuple(p) for p in result.centerline_points.tolist()]
+            for point in points:
+                cv2.circle(vis, point, 5, (0, 255, 0), -1)
                 
             # Connect points with line
-            for i in range(len(result.centerline_points) - 1):
-                pt1 = result.centerline_points[i]
-                pt2 = result.centerline_points[i + 1]
+            for pt1, pt2 in zip(points, points[1:]):
                 cv2.line(vis, pt1, pt2, (255, 0, 255), 2)
 
         # Draw bottom center point (target)
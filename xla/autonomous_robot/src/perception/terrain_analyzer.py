@@ -10,12 +10,17 @@ Sử dụng với RealSense depth camera.
 """
 
 import cv2
+import math
 import numpy as np
 import logging
-from typing import Optional, Tuple
+import queue
+import threading
+from typing import Callable, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum, auto
 
+from .terrain_kernels import gather_valid_depths, NUMBA_AVAILABLE
+
 logger = logging.getLogger(__name__)
 
 
@@ -50,7 +55,76 @@ class TerrainAnalysisResult:
     message: str = ""
 
 
-@dataclass 
+class _MedianWindow:
+    """Median of the last N values, kept in a fixed ring buffer."""
+    __slots__ = ('_values', '_index', '_count')
+    
+    def __init__(self, size: int):
+        self._values = [0.0] * max(1, size)
+        self._index = 0
+        self._count = 0
+    
+    def push(self, value: float) -> float:
+        """Add a value and return the median of the window (same as np.median)."""
+        size = len(self._values)
+        self._values[self._index] = float(value)
+        self._index = (self._index + 1) % size
+        if self._count < size:
+            self._count += 1
+        
+        ordered = sorted(self._values[:self._count])
+        mid = self._count // 2
+        if self._count % 2:
+            return ordered[mid]
+        return (ordered[mid - 1] + ordered[mid]) / 2
+    
+    def clear(self) -> None:
+        """Forget all values."""
+        self._index = 0
+        self._count = 0
+
+
+def _percentile_inplace(values: np.ndarray, q: float) -> float:
+    """
+    np.percentile(values, q) (linear method) with a single partition.
+
+    values is reordered in place. np.percentile partitions around both
+    neighbouring ranks; here only the lower one is placed and the upper one
+    is the minimum of the part above it.
+    """
+    pos = q / 100.0 * (values.size - 1)
+    k = int(pos)
+    t = pos - k
+    values.partition(k)
+    lo = values[k]
+    if t == 0:
+        return float(lo)
+
+    hi = values[k + 1:].min()
+    d = hi - lo
+    # Same interpolation formula as NumPy's _lerp
+    return float(hi - d * (1 - t)) if t >= 0.5 else float(lo + d * t)
+
+
+def _median_inplace(values: np.ndarray) -> float:
+    """
+    np.median(values) with a single partition.
+
+    values is reordered in place. For an even size the lower middle value is
+    the maximum below the partition point, and the two are averaged with
+    np.mean like np.median does (same rounding).
+    """
+    k = values.size // 2
+    values.partition(k)
+    if values.size % 2:
+        return float(values[k])
+
+    j = values[:k].argmax()
+    values[j], values[k - 1] = values[k - 1], values[j]
+    return float(np.mean(values[k - 1:k + 1]))
+
+
+@dataclass
 class TerrainConfig:
     """Cấu hình phân tích địa hình."""
     # Robot dimensions
@@ -84,7 +158,9 @@ class TerrainConfig:
     # Processing
     depth_min_valid: float = 0.1
     depth_max_valid: float = 5.0
+    depth_scale: float = 0.001          # Mét / đơn vị cho depth thô uint16 (RealSense)
     smoothing_window: int = 5           # Số frame để smooth kết quả
+    zone_step: int = 1                  # Lấy mẫu mỗi N pixel theo 2 chiều (2 = đọc 1/4 vùng)
 
 
 class TerrainAnalyzer:
@@ -99,13 +175,54 @@ class TerrainAnalyzer:
             robot.set_height(result.recommended_height)
     """
     
+    # Action indicator colors, indexed by ClearanceAction value - 1
+    _ACTION_COLORS = (
+        (0, 255, 0),      # NORMAL
+        (0, 255, 255),    # RAISE
+        (255, 165, 0),    # LOWER
+        (0, 0, 255),      # STOP
+    )
+    
     def __init__(self, config: Optional[TerrainConfig] = None):
         """Khởi tạo terrain analyzer."""
         self.config = config or TerrainConfig()
         
         # Smoothing buffers
-        self._ceiling_history = []
-        self._obstacle_history = []
+        self._ceiling_history = _MedianWindow(self.config.smoothing_window)
+        self._obstacle_history = _MedianWindow(self.config.smoothing_window)
+        
+        # Zone slices and ground-angle sine, rebuilt only when the frame size
+        # or the config values they depend on change (tools tune them live)
+        self._zone_key: Optional[tuple] = None
+        self._ceiling_slice: Tuple[slice, slice] = (slice(0), slice(0))
+        self._ground_slice: Tuple[slice, slice] = (slice(0), slice(0))
+        self._min_valid_count = 100
+        self._angle_key: Optional[Tuple[float, float]] = None
+        self._ground_angle_sin = 0.0
+        
+        # Valid-depth scratch per zone, reused across frames (plus the
+        # comparison masks when the NumPy fallback is used)
+        self._ceiling_buf: Optional[np.ndarray] = None
+        self._ground_buf: Optional[np.ndarray] = None
+        self._ceiling_masks: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._ground_masks: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        
+        # Frames waiting for the display thread (analyze_and_enqueue), drawn
+        # on copies from a small owned pool: camera frames are only valid
+        # until the next get_frames()
+        self._vis_queue: queue.Queue = queue.Queue(maxsize=2)
+        self._vis_free: queue.Queue = queue.Queue()
+        self._vis_allocated = 0
+        self._display_stop = threading.Event()
+        self._display_thread: Optional[threading.Thread] = None
+        
+        if NUMBA_AVAILABLE:
+            # Compile (or load cached) kernels now instead of on the first
+            # frame; the ceiling zone is a strided view, the ground zone is not
+            for dtype in (np.float32, np.uint16):
+                dummy = np.ones((4, 4), dtype=dtype)
+                gather_valid_depths(dummy, 0.5, 2.0)
+                gather_valid_depths(dummy[:, 1:-1], 0.5, 2.0)
         
         logger.info("TerrainAnalyzer initialized")
     
@@ -118,7 +235,11 @@ class TerrainAnalyzer:
         Phân tích depth frame để detect địa hình.
         
         Args:
-            depth_frame: Depth image (meters)
+            depth_frame: Depth image in meters, or raw uint16 depth
+                (get_raw_frames(align=True), so the zones line up with
+                color_frame) in units of config.depth_scale - the zones
+                are then scanned at half the bytes and only the resulting
+                distances are converted
             color_frame: Optional color frame for visualization
             
         Returns:
@@ -132,40 +253,96 @@ class TerrainAnalyzer:
         
         h, w = depth_frame.shape[:2]
         
+        # Meters per depth unit
+        if np.issubdtype(depth_frame.dtype, np.integer):
+            scale = self.config.depth_scale
+        else:
+            scale = 1.0
+        
+        self._update_zones(h, w)
+        
         # 1. Analyze ceiling zone
-        ceiling_result = self._analyze_ceiling(depth_frame, h, w)
+        ceiling_result = self._analyze_ceiling(depth_frame, scale)
         
         # 2. Analyze ground obstacles
-        ground_result = self._analyze_ground(depth_frame, h, w)
+        ground_result = self._analyze_ground(depth_frame, scale)
         
         # 3. Determine action
         result = self._determine_action(ceiling_result, ground_result)
         
         return result
     
+    def _update_zones(self, h: int, w: int) -> None:
+        """Rebuild the ceiling/ground zone slices if size, zone ratios or step changed."""
+        cfg = self.config
+        step = max(1, int(cfg.zone_step))
+        key = (h, w, cfg.ceiling_zone_top, cfg.ceiling_zone_bottom,
+               cfg.ground_zone_top, cfg.ground_zone_bottom, step)
+        if key == self._zone_key:
+            return
+        
+        self._zone_key = key
+        x_margin = int(w * 0.1)  # Bỏ 10% hai bên
+        # Subsampled zones are strided views, no copy
+        self._ceiling_slice = (
+            slice(int(h * cfg.ceiling_zone_top), int(h * cfg.ceiling_zone_bottom), step),
+            slice(x_margin, w - x_margin, step)
+        )
+        self._ground_slice = (
+            slice(int(h * cfg.ground_zone_top), int(h * cfg.ground_zone_bottom), step),
+            slice(None, None, step)
+        )
+        # "Enough data" is the same share of the zone whatever the step
+        self._min_valid_count = max(1, 100 // (step * step))
+    
+    def _get_ground_angle_sin(self) -> float:
+        """sin of the average ground-zone ray angle, recomputed when the camera pose changes."""
+        key = (self.config.camera_tilt_angle, self.config.camera_vfov)
+        if key != self._angle_key:
+            self._angle_key = key
+            # Góc trung bình của ground zone so với horizon
+            # Center của frame nghiêng 15°, bottom frame nghiêng thêm ~FOV/2
+            avg_ground_angle = self.config.camera_tilt_angle + self.config.camera_vfov * 0.25
+            self._ground_angle_sin = math.sin(math.radians(avg_ground_angle))
+        return self._ground_angle_sin
+    
+    @staticmethod
+    def _zone_buffer(buf: Optional[np.ndarray], zone: np.ndarray) -> np.ndarray:
+        """Scratch buffer large enough for every depth of a zone."""
+        if buf is None or buf.size < zone.size or buf.dtype != zone.dtype:
+            buf = np.empty(zone.size, dtype=zone.dtype)
+        return buf
+    
+    @staticmethod
+    def _zone_masks(
+        masks: Optional[Tuple[np.ndarray, np.ndarray]],
+        zone: np.ndarray
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Bool scratch for the NumPy validity masks (unused with numba)."""
+        if NUMBA_AVAILABLE:
+            return None
+        if masks is None or masks[0].shape != zone.shape:
+            masks = (np.empty(zone.shape, dtype=bool), np.empty(zone.shape, dtype=bool))
+        return masks
+    
     def _analyze_ceiling(
         self, 
         depth_frame: np.ndarray, 
-        h: int, 
-        w: int
+        scale: float = 1.0
     ) -> dict:
         """Phân tích vùng trần/phía trên."""
         # Extract ceiling zone
-        y_start = int(h * self.config.ceiling_zone_top)
-        y_end = int(h * self.config.ceiling_zone_bottom)
-        x_margin = int(w * 0.1)  # Bỏ 10% hai bên
-        
-        ceiling_zone = depth_frame[y_start:y_end, x_margin:w-x_margin]
+        ceiling_zone = depth_frame[self._ceiling_slice]
         
         # Filter valid depths
-        valid_mask = (
-            (ceiling_zone > self.config.depth_min_valid) & 
-            (ceiling_zone < self.config.depth_max_valid)
+        self._ceiling_buf = self._zone_buffer(self._ceiling_buf, ceiling_zone)
+        self._ceiling_masks = self._zone_masks(self._ceiling_masks, ceiling_zone)
+        valid_depths, _ = gather_valid_depths(
+            ceiling_zone, self.config.depth_min_valid / scale, self.config.depth_max_valid / scale,
+            self._ceiling_buf, self._ceiling_masks
         )
         
-        valid_depths = ceiling_zone[valid_mask]
-        
-        if valid_depths.size < 100:  # Không đủ data
+        if valid_depths.size < self._min_valid_count:  # Không đủ data
             return {
                 'detected': False,
                 'distance': -1.0,
@@ -173,14 +350,10 @@ class TerrainAnalyzer:
             }
         
         # Tính khoảng cách trần (dùng percentile thấp để lấy điểm gần nhất)
-        ceiling_distance = float(np.percentile(valid_depths, 10))
+        ceiling_distance = _percentile_inplace(valid_depths, 10.0) * scale
         
         # Smooth với history
-        self._ceiling_history.append(ceiling_distance)
-        if len(self._ceiling_history) > self.config.smoothing_window:
-            self._ceiling_history = self._ceiling_history[-self.config.smoothing_window:]
-        
-        smoothed_distance = np.median(self._ceiling_history)
+        smoothed_distance = self._ceiling_history.push(ceiling_distance)
         
         # Check clearance
         clearance_ok = smoothed_distance >= self.config.ceiling_min_clearance
@@ -195,25 +368,22 @@ class TerrainAnalyzer:
     def _analyze_ground(
         self, 
         depth_frame: np.ndarray, 
-        h: int, 
-        w: int
+        scale: float = 1.0
     ) -> dict:
         """Phân tích vùng mặt đất để tìm chướng ngại vật."""
         # Extract ground zone
-        y_start = int(h * self.config.ground_zone_top)
-        y_end = int(h * self.config.ground_zone_bottom)
-        
-        ground_zone = depth_frame[y_start:y_end, :]
-        
-        # Filter valid depths
-        valid_mask = (
-            (ground_zone > self.config.depth_min_valid) & 
-            (ground_zone < self.config.depth_max_valid)
+        ground_zone = depth_frame[self._ground_slice]
+        
+        # Filter valid depths (and keep the nearest one)
+        self._ground_buf = self._zone_buffer(self._ground_buf, ground_zone)
+        self._ground_masks = self._zone_masks(self._ground_masks, ground_zone)
+        valid_depths, nearest = gather_valid_depths(
+            ground_zone, self.config.depth_min_valid / scale, self.config.depth_max_valid / scale,
+            self._ground_buf, self._ground_masks
         )
+        nearest *= scale
         
-        valid_depths = ground_zone[valid_mask]
-        
-        if valid_depths.size < 100:
+        if valid_depths.size < self._min_valid_count:
             return {
                 'obstacle': False,
                 'height': 0.0,
@@ -222,12 +392,13 @@ class TerrainAnalyzer:
             }
         
         # Baseline: khoảng cách mặt đất bình thường (median)
-        baseline = float(np.median(valid_depths))
+        # valid_depths is scratch, so the median partitions it in place
+        baseline = _median_inplace(valid_depths) * scale
         
         # Tìm điểm gần hơn baseline nhiều → chướng ngại vật
-        obstacle_mask = valid_depths < (baseline - self.config.obstacle_threshold)
-        
-        if not np.any(obstacle_mask):
+        # An obstacle exists iff the nearest point is past the threshold, and
+        # that point is then the nearest obstacle point - no mask needed
+        if not nearest < (baseline - self.config.obstacle_threshold):
             return {
                 'obstacle': False,
                 'height': 0.0,
@@ -235,8 +406,7 @@ class TerrainAnalyzer:
                 'can_step_over': True
             }
         
-        obstacle_depths = valid_depths[obstacle_mask]
-        obstacle_distance = float(np.min(obstacle_depths))
+        obstacle_distance = nearest
         
         # Ước tính chiều cao chướng ngại vật
         # 
@@ -265,21 +435,12 @@ class TerrainAnalyzer:
         
         depth_diff = baseline - obstacle_distance
         
-        # Góc trung bình của ground zone so với horizon
-        # Center của frame nghiêng 15°, bottom frame nghiêng thêm ~FOV/2
-        avg_ground_angle = self.config.camera_tilt_angle + self.config.camera_vfov * 0.25
-        angle_rad = np.radians(avg_ground_angle)
-        
-        # Chiều cao = chênh lệch depth × sin(góc)
-        estimated_height = depth_diff * np.sin(angle_rad)
+        # Chiều cao = chênh lệch depth × sin(góc trung bình của ground zone)
+        estimated_height = depth_diff * self._get_ground_angle_sin()
         estimated_height = min(0.3, max(0, estimated_height))  # Clamp
         
         # Smooth
-        self._obstacle_history.append(estimated_height)
-        if len(self._obstacle_history) > self.config.smoothing_window:
-            self._obstacle_history = self._obstacle_history[-self.config.smoothing_window:]
-        
-        smoothed_height = np.median(self._obstacle_history)
+        smoothed_height = self._obstacle_history.push(estimated_height)
         
         can_step_over = smoothed_height <= self.config.max_step_height
         
@@ -363,14 +524,119 @@ class TerrainAnalyzer:
         
         return result
     
+    def analyze_and_enqueue(
+        self,
+        depth_frame: np.ndarray,
+        color_frame: np.ndarray
+    ) -> TerrainAnalysisResult:
+        """
+        analyze(), then hand a copy of the color frame to the display thread.
+        
+        The copy goes into a buffer owned by the analyzer, so the caller may
+        reuse color_frame right away (camera buffers are recycled). When the
+        display is two frames behind, the frame is dropped rather than
+        blocking the analysis loop.
+        
+        Args:
+            depth_frame: Depth frame, as for analyze()
+            color_frame: Color frame to draw the result on
+            
+        Returns:
+            TerrainAnalysisResult
+        """
+        result = self.analyze(depth_frame, color_frame)
+        
+        buf = self._take_vis_buffer(color_frame)
+        if buf is None:
+            return result
+        np.copyto(buf, color_frame)
+        try:
+            self._vis_queue.put_nowait((buf, result))
+        except queue.Full:
+            self._vis_free.put_nowait(buf)
+        return result
+    
+    def _take_vis_buffer(self, color_frame: np.ndarray) -> Optional[np.ndarray]:
+        """Free display buffer shaped like color_frame, or None if all are in use."""
+        # 2 queued + 1 being drawn
+        pool_size = self._vis_queue.maxsize + 1
+        while True:
+            try:
+                buf = self._vis_free.get_nowait()
+            except queue.Empty:
+                break
+            if buf.shape == color_frame.shape and buf.dtype == color_frame.dtype:
+                return buf
+            # Frame size changed: retire the old buffer
+            self._vis_allocated -= 1
+        
+        if self._vis_allocated >= pool_size:
+            return None
+        self._vis_allocated += 1
+        return np.empty_like(color_frame)
+    
+    def run_display_thread(self, on_frame: Callable[[np.ndarray], None]) -> None:
+        """
+        Start a background thread that visualizes enqueued results.
+        
+        Args:
+            on_frame: Called with each visualization (e.g. to show or record
+                it), on the display thread. The image is a pooled buffer,
+                reused after on_frame returns - copy it to keep it
+        """
+        if self._display_thread is not None:
+            return
+        self._display_stop.clear()
+        self._display_thread = threading.Thread(
+            target=self._display_loop,
+            args=(on_frame,),
+            daemon=True
+        )
+        self._display_thread.start()
+    
+    def stop_display_thread(self) -> None:
+        """Stop the display thread and drop frames still queued."""
+        if self._display_thread is None:
+            return
+        self._display_stop.set()
+        self._display_thread.join()
+        self._display_thread = None
+        
+        while True:
+            try:
+                buf, _ = self._vis_queue.get_nowait()
+            except queue.Empty:
+                break
+            self._vis_free.put_nowait(buf)
+    
+    def _display_loop(self, on_frame: Callable[[np.ndarray], None]) -> None:
+        """Display thread: visualize queued results until stopped."""
+        while not self._display_stop.is_set():
+            try:
+                buf, result = self._vis_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            # visualize() only draws on the color frame (depth is unused)
+            try:
+                on_frame(self.visualize(buf, None, result, inplace=True))
+            finally:
+                self._vis_free.put_nowait(buf)
+    
     def visualize(
         self, 
         color_frame: np.ndarray, 
-        depth_frame: np.ndarray,
-        result: TerrainAnalysisResult
+        depth_frame: Optional[np.ndarray],
+        result: TerrainAnalysisResult,
+        inplace: bool = False
     ) -> np.ndarray:
-        """Tạo visualization với các vùng phân tích."""
-        vis = color_frame.copy()
+        """
+        Tạo visualization với các vùng phân tích.
+        
+        Args:
+            inplace: Draw directly on color_frame instead of a copy, for
+                callers that no longer need the original frame
+        """
+        vis = color_frame if inplace else color_frame.copy()
         h, w = vis.shape[:2]
         
         # Draw ceiling zone
@@ -390,13 +656,7 @@ class TerrainAnalyzer:
                    (10, y_ground_start - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, ground_color, 1)
         
         # Action indicator
-        action_colors = {
-            ClearanceAction.NORMAL: (0, 255, 0),
-            ClearanceAction.RAISE: (0, 255, 255),
-            ClearanceAction.LOWER: (255, 165, 0),
-            ClearanceAction.STOP: (0, 0, 255),
-        }
-        action_color = action_colors.get(result.action, (255, 255, 255))
+        action_color = self._ACTION_COLORS[result.action.value - 1]
         
         # Status bar
         cv2.rectangle(vis, (0, h - 60), (w, h), (40, 40, 40), -1)
@@ -411,5 +671,5 @@ class TerrainAnalyzer:
     
     def reset(self):
         """Reset history buffers."""
-        self._ceiling_history = []
-        self._obstacle_history = []
+        self._ceiling_history.clear()
+        self._obstacle_history.clear()
@@ -9,14 +9,39 @@ import time
 import logging
 import threading
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Deque
 from dataclasses import dataclass, asdict
 from datetime import datetime
+from functools import lru_cache
+from collections import deque
 
 from src.communication import RobotFeedback
 
 logger = logging.getLogger(__name__)
 
+# Log columns, in the order of the queued row tuples
+_COLUMNS = [
+    'time', 'cmd_v', 'cmd_yaw', 
+    'fb_v', 'fb_pos', 'fb_yaw', 'fb_yaw_rate',
+    'mode', 'state', 
+    'line_detected', 'pos_error', 'heading_error', 'confidence'
+]
+
+# Rows per Parquet row group. The file is only readable once closed anyway,
+# so rows are held until a group is full instead of one group per flush
+_PARQUET_ROW_GROUP = 10000
+
+# One CSV row, same columns and text as csv.writer with the f"{:.3f}" fields
+_ROW_FORMAT = "%.3f,%.3f,%.3f,%.3f,%.3f,%.3f,%.3f,%s,%s,%d,%.3f,%.3f,%.3f\r\n"
+
+
+@lru_cache(maxsize=256)
+def _csv_field(text: str) -> str:
+    """Quote a string field the way csv.writer (QUOTE_MINIMAL) does."""
+    if any(c in text for c in ',"\r\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
 
 @dataclass
 class LogEntry:
@@ -46,7 +71,10 @@ class LogEntry:
 
 class DataLogger:
     """
-    Logs robot data to CSV file for analysis.
+    Logs robot data to CSV (or Parquet) file for analysis.
+    
+    log() only queues the entry; a writer thread formats and writes the
+    file, so file IO never stalls the control loop.
     
     Usage:
         logger = DataLogger("robot_log.csv")
@@ -62,7 +90,9 @@ class DataLogger:
         self, 
         filename: Optional[str] = None,
         log_dir: str = "logs",
-        buffer_size: int = 100
+        buffer_size: int = 100,
+        flush_interval: float = 1.0,
+        file_format: str = "csv"
     ):
         """
         Initialize data logger.
@@ -70,8 +100,16 @@ class DataLogger:
         Args:
             filename: Log file name (auto-generated if None)
             log_dir: Directory for log files
-            buffer_size: Number of entries to buffer before writing
+            buffer_size: Number of entries to buffer before writing (the
+                queue holds 4x this; the oldest entries are dropped beyond)
+            flush_interval: Max seconds a queued entry waits to be written
+            file_format: "csv", or "parquet" (needs pyarrow) for a smaller
+                binary log with float32 columns and Snappy compression
         """
+        if file_format not in ("csv", "parquet"):
+            raise ValueError(f"Unknown log file format: {file_format}")
+        self._file_format = file_format
+        
         # Create log directory
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok=True)
@@ -79,15 +117,26 @@ class DataLogger:
         # Generate filename if not provided
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"robot_log_{timestamp}.csv"
+            filename = f"robot_log_{timestamp}.{file_format}"
         
         self.filepath = self.log_dir / filename
         
-        self._buffer: List[LogEntry] = []
-        self._buffer_size = buffer_size
-        self._lock = threading.Lock()
+        # One plain tuple per entry, in CSV column order (no LogEntry
+        # objects on the logging path). A full deque drops its oldest entry.
+        self._buffer_size = max(1, buffer_size)
+        self._flush_interval = flush_interval
+        self._queue: Deque[tuple] = deque(maxlen=self._buffer_size * 4)
+        self._wake = threading.Event()
+        self._writer_thread: Optional[threading.Thread] = None
+        self._logged = 0
+        # Entries lost to write errors; errors are logged once per failing run
+        self._failed = 0
+        self._write_ok = True
         self._file = None
         self._writer = None
+        self._pq_writer = None
+        self._pq_schema = None
+        self._pq_rows: List[tuple] = []
         self._running = False
         self._start_time = 0.0
         self._entry_count = 0
@@ -97,32 +146,56 @@ class DataLogger:
     def start(self) -> None:
         """Start logging."""
         self._start_time = time.time()
-        self._file = open(self.filepath, 'w', newline='')
-        self._writer = csv.writer(self._file)
         
-        # Write header
-        header = [
-            'time', 'cmd_v', 'cmd_yaw', 
-            'fb_v', 'fb_pos', 'fb_yaw', 'fb_yaw_rate',
-            'mode', 'state', 
-            'line_detected', 'pos_error', 'heading_error', 'confidence'
-        ]
-        self._writer.writerow(header)
+        if self._file_format == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            
+            types = [pa.float64()] + [pa.float32()] * 6 + [pa.string()] * 2 + \
+                [pa.int8()] + [pa.float32()] * 3
+            self._pq_schema = pa.schema(list(zip(_COLUMNS, types)))
+            self._pq_writer = pq.ParquetWriter(
+                str(self.filepath), self._pq_schema, compression='snappy'
+            )
+        else:
+            self._file = open(self.filepath, 'w', newline='')
+            self._writer = csv.writer(self._file)
+            
+            # Write header
+            self._writer.writerow(_COLUMNS)
         
         self._running = True
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop,
+            daemon=True
+        )
+        self._writer_thread.start()
         logger.info(f"Logging started: {self.filepath}")
     
     def stop(self) -> None:
         """Stop logging and flush buffer."""
         self._running = False
         
-        # Flush remaining buffer
-        self._flush_buffer()
+        # Writer drains what is queued, then exits
+        if self._writer_thread is not None:
+            self._wake.set()
+            self._writer_thread.join()
+            self._writer_thread = None
         
         if self._file is not None:
             self._file.close()
             self._file = None
+        if self._pq_writer is not None:
+            if self._pq_rows:
+                self._write_row_group()
+            self._pq_writer.close()
+            self._pq_writer = None
         
+        if self._failed > 0:
+            logger.error(f"{self._failed} log entries could not be written")
+        dropped = self._logged - self._entry_count - self._failed
+        if dropped > 0:
+            logger.warning(f"Log queue overflowed, {dropped} entries dropped")
         logger.info(f"Logging stopped. {self._entry_count} entries written to {self.filepath}")
     
     def log(
@@ -154,63 +227,96 @@ class DataLogger:
         if not self._running:
             return
         
-        entry = LogEntry(
-            timestamp=time.time() - self._start_time,
-            cmd_velocity=cmd_velocity,
-            cmd_yaw_rate=cmd_yaw_rate,
-            mode=mode_name,
-            mode_state=mode_state,
-            line_detected=line_detected,
-            position_error=position_error,
-            heading_error=heading_error,
-            confidence=confidence
-        )
-        
         if feedback is not None:
-            entry.fb_velocity = feedback.velocity
-            entry.fb_position = feedback.position
-            entry.fb_yaw = feedback.yaw
-            entry.fb_yaw_rate = feedback.yaw_rate
+            fb = (feedback.velocity, feedback.position, feedback.yaw, feedback.yaw_rate)
+        else:
+            fb = (0.0, 0.0, 0.0, 0.0)
         
-        with self._lock:
-            self._buffer.append(entry)
+        row = (
+            time.time() - self._start_time, cmd_velocity, cmd_yaw_rate, *fb,
+            str(mode_name), str(mode_state),
+            int(line_detected), position_error, heading_error, confidence
+        )
+        
+        # Never blocks: if the writer fell behind (slow disk) the oldest
+        # queued entry is dropped
+        self._queue.append(row)
+        self._logged += 1
+        if len(self._queue) >= self._buffer_size:
+            self._wake.set()
+    
+    def _writer_loop(self) -> None:
+        """Background thread: write queued rows in blocks until stopped."""
+        while True:
+            # Woken by a full buffer or stop(), else write every flush_interval
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            running = self._running
             
-            if len(self._buffer) >= self._buffer_size:
-                self._flush_buffer()
+            rows = []
+            while True:
+                try:
+                    rows.append(self._queue.popleft())
+                except IndexError:
+                    break
+            if rows:
+                self._write_rows(rows)
+            
+            if not running:
+                return
     
-    def _flush_buffer(self) -> None:
-        """Write buffer to file."""
-        if self._writer is None:
+    def _write_rows(self, rows: List[tuple]) -> None:
+        """Write queued entries as one block."""
+        if self._pq_writer is not None:
+            self._pq_rows.extend(rows)
+            self._entry_count += len(rows)
+            if len(self._pq_rows) >= _PARQUET_ROW_GROUP:
+                self._write_row_group()
             return
         
-        with self._lock:
-            for entry in self._buffer:
-                row = [
-                    f"{entry.timestamp:.3f}",
-                    f"{entry.cmd_velocity:.3f}",
-                    f"{entry.cmd_yaw_rate:.3f}",
-                    f"{entry.fb_velocity:.3f}",
-                    f"{entry.fb_position:.3f}",
-                    f"{entry.fb_yaw:.3f}",
-                    f"{entry.fb_yaw_rate:.3f}",
-                    entry.mode,
-                    entry.mode_state,
-                    int(entry.line_detected),
-                    f"{entry.position_error:.3f}",
-                    f"{entry.heading_error:.3f}",
-                    f"{entry.confidence:.3f}"
-                ]
-                self._writer.writerow(row)
-                self._entry_count += 1
-            
-            self._buffer.clear()
-        
-        if self._file is not None:
+        # One format call per row and one write for the whole block
+        try:
+            self._file.write("".join([
+                _ROW_FORMAT % (*row[:7], _csv_field(row[7]), _csv_field(row[8]), *row[9:])
+                for row in rows
+            ]))
             self._file.flush()
+        except Exception:
+            self._write_failed(len(rows))
+            return
+        self._entry_count += len(rows)
+        self._write_ok = True
+    
+    def _write_row_group(self) -> None:
+        """Write the held rows as one Parquet row group."""
+        import pyarrow as pa
+        
+        rows, self._pq_rows = self._pq_rows, []
+        try:
+            # Rows to columns
+            columns = list(zip(*rows))
+            batch = pa.RecordBatch.from_arrays(
+                [pa.array(col, type=field.type)
+                 for col, field in zip(columns, self._pq_schema)],
+                schema=self._pq_schema
+            )
+            self._pq_writer.write_batch(batch)
+        except Exception:
+            self._entry_count -= len(rows)
+            self._write_failed(len(rows))
+            return
+        self._write_ok = True
+    
+    def _write_failed(self, count: int) -> None:
+        """Record a failed block write; the writer keeps going with the next."""
+        self._failed += count
+        if self._write_ok:
+            logger.exception(f"Failed to write {count} log entries to {self.filepath}")
+        self._write_ok = False
     
     def get_entry_count(self) -> int:
         """Get number of logged entries."""
-        return self._entry_count + len(self._buffer)
+        return self._entry_count + len(self._queue)
 
 
 class SessionSummary:
@@ -227,7 +333,7 @@ class SessionSummary:
         Generate summary from log file.
         
         Args:
-            log_file: Path to CSV log file
+            log_file: Path to CSV or .parquet log file
             output_file: Path to save summary JSON (optional)
             
         Returns:
@@ -235,7 +341,10 @@ class SessionSummary:
         """
         import pandas as pd
         
-        df = pd.read_csv(log_file)
+        if Path(log_file).suffix == '.parquet':
+            df = pd.read_parquet(log_file)
+        else:
+            df = pd.read_csv(log_file)
         
         summary = {
             'file': str(log_file),
@@ -38,6 +38,11 @@ class CameraCalibrationTool:
     WINDOW_NAME = "Camera Calibration"
     CALIB_FILE = PROJECT_ROOT / "data" / "calibration" / "camera_intrinsics.json"
     
+    # findChessboardCornersSB: sub-pixel corners without cornerSubPix and no
+    # multi-frame stalls on cluttered scenes, but several times slower than
+    # the classic detector on a clean board unless OpenCV runs it in parallel
+    USE_SB_DETECTOR = False
+    
     def __init__(self):
         self.camera = RealSenseCamera()
         
@@ -57,8 +62,14 @@ class CameraCalibrationTool:
         self.calibration_error = 0.0
         self.calibrated = False
         
+        # Grayscale preview frame, reused across frames
+        self._gray = None
+        
         # Prepare object points
         self._prepare_object_points()
+        
+        if self.USE_SB_DETECTOR and cv2.getNumThreads() <= 1:
+            print("⚠️ OpenCV has no parallel backend - findChessboardCornersSB will be slow")
     
     def _prepare_object_points(self):
         """Prepare 3D object points for checkerboard."""
@@ -69,8 +80,23 @@ class CameraCalibrationTool:
         self.object_points_template = objp
     
     def _detect_checkerboard(self, frame):
-        """Detect checkerboard corners in frame."""
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        """
+        Detect checkerboard corners in frame (pixel accuracy, for preview).
+        
+        Sub-pixel refinement is left to _capture_calibration_image, so
+        frames that are never captured do not pay for it. The SB detector
+        returns sub-pixel corners directly.
+        """
+        if self._gray is None or self._gray.shape != frame.shape[:2]:
+            self._gray = np.empty(frame.shape[:2], np.uint8)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        
+        if self.USE_SB_DETECTOR:
+            return cv2.findChessboardCornersSB(
+                gray,
+                self.board_size,
+                flags=cv2.CALIB_CB_NORMALIZE_IMAGE | cv2.CALIB_CB_ACCURACY
+            )
         
         # Find checkerboard corners
         ret, corners = cv2.findChessboardCorners(
@@ -79,15 +105,19 @@ class CameraCalibrationTool:
             cv2.CALIB_CB_ADAPTIVE_THRESH + cv2.CALIB_CB_FAST_CHECK + cv2.CALIB_CB_NORMALIZE_IMAGE
         )
         
-        if ret:
-            # Refine corners to sub-pixel accuracy
-            criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001)
-            corners = cv2.cornerSubPix(gray, corners, (11, 11), (-1, -1), criteria)
-        
         return ret, corners
     
+    def _refine_corners(self, frame, corners):
+        """Refine detected corners to sub-pixel accuracy."""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001)
+        return cv2.cornerSubPix(gray, corners, (11, 11), (-1, -1), criteria)
+    
     def _capture_calibration_image(self, frame, corners):
         """Capture frame for calibration."""
+        if not self.USE_SB_DETECTOR:
+            # cornerSubPix would only degrade SB corners
+            corners = self._refine_corners(frame, corners)
         self.obj_points.append(self.object_points_template)
         self.img_points.append(corners)
         self.calibration_images.append(frame.copy())
@@ -123,19 +153,12 @@ class CameraCalibrationTool:
             self.dist_coeffs = dist_coeffs
             self.calibrated = True
             
-            # Calculate reprojection error
-            total_error = 0
-            for i in range(len(self.obj_points)):
-                img_points_proj, _ = cv2.projectPoints(
-                    self.obj_points[i], rvecs[i], tvecs[i], camera_matrix, dist_coeffs
-                )
-                error = cv2.norm(self.img_points[i], img_points_proj, cv2.NORM_L2) / len(img_points_proj)
-                total_error += error
-            
-            self.calibration_error = total_error / len(self.obj_points)
+            # Reprojection error: calibrateCamera already returns the RMS
+            # over all corners of all images, no need to re-project them
+            self.calibration_error = ret
             
             print("✅ Calibration successful!")
-            print(f"📊 Reprojection error: {self.calibration_error:.3f} pixels")
+            print(f"📊 Reprojection error (RMS): {self.calibration_error:.3f} pixels")
             print(f"📷 Camera matrix:")
             print(f"   fx: {camera_matrix[0,0]:.2f}")
             print(f"   fy: {camera_matrix[1,1]:.2f}")  
@@ -236,7 +259,7 @@ class CameraCalibrationTool:
         
         try:
             while True:
-                color_frame, _ = self.camera.get_frames()
+                color_frame, _ = self.camera.get_frames(align=False)
                 
                 if color_frame is None:
                     continue
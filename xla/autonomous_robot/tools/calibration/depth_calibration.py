@@ -29,6 +29,12 @@ class DepthCalibrationTool:
         self.depth_estimator = DepthEstimator()
         self.click_point = None
         self.measurements = []
+        
+        # Preview buffers, allocated on the first frame and reused
+        self._vis = None
+        self._depth_scaled = None
+        self._depth_u8 = None
+        self._depth_colored = None
     
     def _mouse_callback(self, event, x, y, flags, param):
         """Handle mouse clicks."""
@@ -36,15 +42,26 @@ class DepthCalibrationTool:
             self.click_point = (x, y)
     
     def _create_depth_colormap(self, depth_frame: np.ndarray, max_depth: float = 5.0) -> np.ndarray:
-        """Create colormap visualization of depth."""
-        depth_normalized = (depth_frame / max_depth * 255).clip(0, 255).astype(np.uint8)
-        depth_colormap = cv2.applyColorMap(depth_normalized, cv2.COLORMAP_JET)
-        return depth_colormap
+        """Create colormap visualization of depth (into a reused buffer)."""
+        h, w = depth_frame.shape[:2]
+        if self._depth_u8 is None or self._depth_u8.shape != (h, w):
+            self._depth_scaled = np.empty((h, w), np.float32)
+            self._depth_u8 = np.empty((h, w), np.uint8)
+            self._depth_colored = np.empty((h, w, 3), np.uint8)
+        
+        # (depth / max_depth * 255).clip(0, 255).astype(uint8), without temporaries
+        scaled = self._depth_scaled
+        np.divide(depth_frame, max_depth, out=scaled)
+        np.multiply(scaled, 255, out=scaled)
+        np.clip(scaled, 0, 255, out=scaled)
+        np.copyto(self._depth_u8, scaled, casting='unsafe')
+        
+        return cv2.applyColorMap(self._depth_u8, cv2.COLORMAP_JET, dst=self._depth_colored)
     
     def _draw_grid_measurements(self, frame: np.ndarray, depth_frame: np.ndarray) -> np.ndarray:
-        """Draw depth measurements at grid points."""
+        """Draw depth measurements at grid points (in place)."""
         h, w = frame.shape[:2]
-        vis = frame.copy()
+        vis = frame
         
         # 3x3 grid
         for row in range(3):
@@ -72,11 +89,11 @@ class DepthCalibrationTool:
         return vis
     
     def _draw_click_measurement(self, frame: np.ndarray, depth_frame: np.ndarray) -> np.ndarray:
-        """Draw measurement at clicked point."""
+        """Draw measurement at clicked point (in place)."""
         if self.click_point is None:
             return frame
         
-        vis = frame.copy()
+        vis = frame
         x, y = self.click_point
         depth = self.depth_estimator.get_depth_at_point(depth_frame, x, y)
         
@@ -107,13 +124,13 @@ class DepthCalibrationTool:
         return vis
     
     def _draw_center_measurement(self, frame: np.ndarray, depth_frame: np.ndarray) -> np.ndarray:
-        """Draw continuous center measurement."""
+        """Draw continuous center measurement (in place)."""
         h, w = frame.shape[:2]
         cx, cy = w // 2, h // 2
         
         depth = self.depth_estimator.get_depth_at_point(depth_frame, cx, cy)
         
-        vis = frame.copy()
+        vis = frame
         
         # Center crosshair
         cv2.line(vis, (cx - 30, cy), (cx + 30, cy), (255, 255, 0), 2)
@@ -165,11 +182,14 @@ class DepthCalibrationTool:
                 if color_frame is None or depth_frame is None:
                     continue
                 
-                # Choose base frame
+                # Choose base frame (the overlays below draw on it in place)
                 if show_depth_map:
                     vis = self._create_depth_colormap(depth_frame)
                 else:
-                    vis = color_frame.copy()
+                    if self._vis is None or self._vis.shape != color_frame.shape:
+                        self._vis = np.empty_like(color_frame)
+                    np.copyto(self._vis, color_frame)
+                    vis = self._vis
                 
                 # Draw center measurement
                 vis = self._draw_center_measurement(vis, depth_frame)
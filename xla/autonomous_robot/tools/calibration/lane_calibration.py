@@ -37,6 +37,11 @@ class LaneCalibrationTool:
     def __init__(self):
         self.camera = RealSenseCamera()
         self.params = self._get_default_params()
+        
+        # Parameter info panel, redrawn only when a trackbar value changes
+        self._info_panel = None
+        self._info_key = None
+        
         self._setup_ui()
         
     def _get_default_params(self) -> dict:
@@ -208,14 +213,23 @@ class LaneCalibrationTool:
                        0.7, (0, 255, 0), 2)
             imgs.append(img)
         
-        # Arrange 2x2
+        # Arrange 2x2, parameter info below
         top_row = np.hstack([imgs[0], imgs[1]])
         bottom_row = np.hstack([imgs[2], imgs[3]])
-        display = np.vstack([top_row, bottom_row])
+        info_panel = self._get_info_panel(params, top_row.shape[1])
+        display = np.vstack([top_row, bottom_row, info_panel])
+        
+        return display
+    
+    def _get_info_panel(self, params: dict, width: int) -> np.ndarray:
+        """Parameter info and instructions strip, cached per parameter set."""
+        key = (width, tuple(params.items()))
+        if key == self._info_key:
+            return self._info_panel
         
         # Add parameter info
         info_h = 100
-        info_panel = np.zeros((info_h, display.shape[1], 3), dtype=np.uint8)
+        info_panel = np.zeros((info_h, width, 3), dtype=np.uint8)
         
         info_lines = [
             f"ROI: Top Y={params['roi_top_y']}% X=[{params['roi_top_left_x']}%-{params['roi_top_right_x']}%]",
@@ -228,14 +242,14 @@ class LaneCalibrationTool:
             cv2.putText(info_panel, line, (10, 20 + i * 22),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
         
-        display = np.vstack([display, info_panel])
-        
-        # Add instructions
+        # Add instructions (bottom of the display, inside this strip)
         instr = "[S]ave [C]apture [R]eset [Q]uit"
-        cv2.putText(display, instr, (display.shape[1] - 300, display.shape[0] - 10),
+        cv2.putText(info_panel, instr, (width - 300, info_h - 10),
                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
         
-        return display
+        self._info_panel = info_panel
+        self._info_key = key
+        return info_panel
     
     def save_params(self, params: dict):
         """Save parameters to file."""
@@ -310,7 +324,7 @@ class LaneCalibrationTool:
         
         try:
             while True:
-                color_frame, _ = self.camera.get_frames()
+                color_frame, _ = self.camera.get_frames(align=False)
                 
                 if color_frame is None:
                     continue
@@ -56,7 +56,7 @@ def main():
     
     try:
         while True:
-            color_frame, _ = camera.get_frames()
+            color_frame, _ = camera.get_frames(align=False)
             
             if color_frame is None:
                 continue
@@ -233,8 +233,8 @@ def main():
                 height_diff = result.recommended_height - current_height
                 current_height += height_diff * 0.1  # Smooth 10%
             
-            # Visualize
-            vis = analyzer.visualize(color_frame, depth_frame, result)
+            # Visualize (color_frame is not used afterwards)
+            vis = analyzer.visualize(color_frame, depth_frame, result, inplace=True)
             
             # Add depth visualization side by side
             depth_colored = cv2.applyColorMap(